@@ -0,0 +1,429 @@
+import time, logging, sys, linecache, random, threading, asyncio, atexit
+import undetected_chromedriver as uc
+import best_line
+import blocking
+import board_scripts
+import latency
+import books
+import browsers
+import cooldown
+import name_resolver
+import network_feed
+import odds_math
+import placement
+import scheduler
+import shared_odds
+import tabs
+import workers
+import tick_log
+
+logging.disable(logging.CRITICAL)
+
+class ArbFinder(object):
+    """One browser for one sportsbook, with a tab for each sport"""
+
+    def __init__(self, book, sports, two_person, url=None, network=False, profile=None, blocked=()):
+        self.book, self.sports, self.two_person = book, list(sports), two_person
+        self.url, self.blocked = url or book.URL, blocked
+        self.feed = None
+        self.lock = threading.Lock()  # Scanning and placing take turns with the browser, whichever tab they use
+        self.tabs = dict()  # sport -> tabs.Tab
+        self.started = time.perf_counter()
+        try:
+            # Setup ChromeDriver
+            # In network mode Chrome logs the DevTools Network events, so the odds are read from the JSON payloads
+            options = blocking.prefs(uc.ChromeOptions(), blocked)
+            if len(self.sports) > 1:
+                # Tabs that are not shown keep updating their odds
+                tabs.prefs(options)
+            if network:
+                network_feed.enable(options)
+            # A Chrome profile kept between runs (profile is its folder), or a new one every run (None)
+            with browsers.launching:
+                self.driver = uc.Chrome(options=options, user_data_dir=profile)
+            # No implicit wait, each lookup waits only as long as elements.WAITS says
+            self.driver.implicitly_wait(0)
+            # Images, fonts, media and trackers on the blocklist are never loaded
+            blocking.block(self.driver, blocked)
+            if network:
+                # The payloads are read as the boards of the first sport
+                self.feed = network_feed.NetworkFeed(self.driver, book.parse_payload, two_person[self.sports[0]])
+            self.driver.get(self.url)
+        except:
+            pass
+
+    def set_type(self):
+        # The first sport uses the tab the browser started with, every other sport opens a new tab
+        for n, sport in enumerate(self.sports):
+            try:
+                if n == 0:
+                    handle = self.driver.current_window_handle
+                else:
+                    handle = tabs.open_tab(self.driver, self.url, self.blocked)
+                self.tabs[sport] = tabs.Tab(self.driver, handle, self.lock)
+                with self.tabs[sport]:
+                    self.book.open_sport(self.driver, sport)
+            except Exception as e:
+                print(e)
+
+    def wait_ready(self):
+        # Report when the board of each sport can be read
+        for sport, tab in self.tabs.items():
+            script = self.book.board_script(self.two_person[sport])
+            try:
+                if script is not None:
+                    with tab:
+                        browsers.report(self.book.name + ' ' + sport, self.started,
+                                        browsers.ready(self.driver, script))
+            except Exception as e:
+                print(e)
+
+    def events(self, sport):
+        # Live events of a sport, as the website shows them
+        with self.tabs[sport]:
+            if self.feed and sport == self.sports[0]:
+                self.feed.poll()
+                return list(self.feed.board.values())
+            return board_scripts.read_board(self.driver, self.book.board_script(self.two_person[sport]))
+
+    def board(self, events, names):
+        # Events by the canonical names of both sides, i.e. 'smith vs jones'
+        board = dict()
+        for wagers in events:
+            # Keep the team names from the website, they are used to find the wager to click
+            board[names.resolve(wagers[-2]).lower() + " vs " + names.resolve(wagers[-1]).lower()] = wagers
+        return board
+
+
+def resolver(sport):
+    # Canonical team or player names, so the same event has the same name on every website
+    return name_resolver.NameResolver(name_resolver.MLB_TEAMS if sport == 'Baseball' else None)
+
+
+def work(name, n, tables, sports, two_person, url, network, profile, blocked, launching, interval, commands, running):
+    # Process mode: the browser and scraper of one sportsbook, in a process of its own (workers.py)
+    # It writes the odds as sportsbook n of the shared odds tables, tables is {sport: (name, books, slots)}
+    browsers.launching = launching  # The processes take turns creating their browsers, the same as threads do
+    writers = {sport: shared_odds.Writer(shared_odds.OddsTable(books, slots, table), n)
+               for sport, (table, books, slots) in tables.items()}
+    finder = ArbFinder(books.BOOKS[name], sports, two_person, url, network, profile, blocked)
+    finder.set_type()
+    finder.wait_ready()
+    names = {sport: resolver(sport) for sport in sports}
+    workers.serve(finder, lambda sport: finder.board(finder.events(sport), names[sport]), writers, commands, running,
+                  interval)
+
+
+class App(object):
+    def __init__(self):
+        self.sports = ['Tennis']  # Sports to scan, each in its own tab of every browser. Use {'Baseball': 2, 'Tennis': 1} to scan some sports more often
+        self.two_person = ['Tennis']  # Sports with only moneyline bets on two person or two team events (such as tennis), the others also have spreads and totals
+        self.book_names = ['FanDuel', 'DraftKings', 'William Hill']  # Any number of sportsbooks from books.py
+        self.pairings = []  # Pairs of sportsbooks to compare, i.e. [('FanDuel', 'DraftKings'), ('FanDuel', 'William Hill')]. Leave empty to compare all of them at once
+
+        self.main_bet_amount = 100  # Total amount to wager. The program will split the two bets, so that the total wager is this amount
+        self.lower_limit = 0.000  # Lower arbritage limit to bet on, as a percentage
+        self.upper_limit = 0.070  # Upper arbritage limit to bet on, as a percentage (0.070 = 7%)
+        self.bet_limit = 0.10  # Most websites require a minimum of $0.10 a wager on each bet
+        self.odds_limit = 750  # The upper odds limit that you want to wager on (i.e. +750)
+        self.cross_lines = True  # Also pair different lines of spreads and totals, such as O 8.5 with U 9 (line_ladder.py). False to only pair the same line
+        self.round_decimals = 2  # Decimal places to round each wager to. Use 0 to round to the dollar
+        self.submit_wagers = False  # Submit the wagers once both stakes are entered. Leave False to stop at the Place Bet buttons
+        self.placement_budget = 15  # Seconds from finding an opportunity to placing both wagers, before both betslips are cleared
+        self.bet_cooldown = 60  # Seconds before wagering on the same event and market again. Every other event is still scanned
+        self.miss_cooldown = 5  # Seconds before trying an event and market again, after its odds moved on the betslip
+        self.network_mode = False  # True to read the odds from the JSON the websites download, instead of the page
+        self.urls = dict()  # Other pages to open for a sportsbook, i.e. {'FanDuel': 'http://localhost:8000/live'} for network_stub.py
+        self.scan_interval = 0.01  # Seconds between scans
+        self.processes = False  # True to run the browser and scraper of each sportsbook in its own process (workers.py), so more sportsbooks and sports use more cores
+        self.slots = 1024  # Process mode: most live events of a sport on one sportsbook, the size of the shared odds tables (shared_odds.py)
+        self.gui = True  # False to run without the Start / Stop window, scanning starts straight away
+        self.record = ''  # File to record every scraped board to (tick_log.py), i.e. 'boards.log'. Leave empty to not record
+        self.metrics_file = ''  # Prometheus text file to write the latency of each stage to, i.e. 'arb.prom'. Leave empty to not write it
+        self.metrics_port = 0  # Serve the latency of each stage on http://localhost:<port>/metrics. Use 0 to not serve it
+        self.profiles = 'profiles'  # Folder for the Chrome profile of each sportsbook, so logins and cookies carry over. Leave empty for a new profile every run
+        self.blocked = ['images', 'fonts', 'media', 'trackers']  # What the browsers do not load (blocking.py), categories or URL patterns. Leave empty to load whole pages
+
+        # One browser per sportsbook, shared by every pairing that uses it
+        if self.pairings:
+            self.book_names = list(dict.fromkeys(name for pairing in self.pairings for name in pairing))
+        self.columns = [[self.book_names.index(name) for name in pairing] for pairing in self.pairings] or [None]
+
+        # Which sport each scan reads, in turns
+        self.rotation = tabs.Rotation(self.sports)
+        self.sports = list(self.rotation.weights)
+        self.two_person = {sport: sport in self.two_person for sport in self.sports}
+
+        def start(name):
+            finder = ArbFinder(books.BOOKS[name], self.sports, self.two_person, self.urls.get(name), self.network_mode,
+                               browsers.profile(self.profiles, name), self.blocked)
+            finder.set_type()
+            finder.wait_ready()
+            return finder
+
+        self.running = False
+        self.scanning = workers.context.Event()  # Set while running, for the worker processes
+        if self.processes and self.record:
+            # The workers only share prices, so the boards as the websites show them never reach this process
+            raise ValueError('Recording boards (self.record) needs self.processes = False')
+        if self.processes:
+            # A worker process per sportsbook scrapes its boards into an odds table per sport in shared memory,
+            # this process reads the tables, looks for arbitrages and places wagers
+            # Every worker starts its browser at once
+            self.odds_tables = {sport: shared_odds.OddsTable(len(self.book_names), self.slots) for sport in self.sports}
+            # Removed when the program ends, also without the window or after an error
+            atexit.register(self.unlink)
+            self.readers = {sport: shared_odds.Reader(table) for sport, table in self.odds_tables.items()}
+            tables = {sport: (table.name, table.books, table.slots) for sport, table in self.odds_tables.items()}
+            launching = workers.context.Lock()
+            self.finders = []
+            self.workers = [workers.Worker(name, work, (name, n, tables, self.sports, self.two_person,
+                                                        self.urls.get(name), self.network_mode,
+                                                        browsers.profile(self.profiles, name), self.blocked, launching,
+                                                        self.scan_interval), self.scanning)
+                            for n, name in enumerate(self.book_names)]
+        else:
+            # Start every browser at once
+            self.odds_tables, self.readers, self.workers = dict(), dict(), []
+            self.finders = browsers.parallel(*[lambda name=name: start(name) for name in self.book_names])
+
+        # Latest board of each sportsbook, and the best price of every wager across all of them, for each sport
+        self.boards = {sport: [dict() for name in self.book_names] for sport in self.sports}
+        self.tables = {sport: best_line.BestLineTable(self.book_names) for sport in self.sports}
+        self.old_lists = dict.fromkeys(self.sports, '')
+        self.scanned = set()  # Sports of the latest scan
+        self.recorder = tick_log.TickRecorder(self.record) if self.record else None
+        self.metrics = latency.Metrics(self.metrics_file, self.metrics_port)
+
+        # Both wagers of an arbitrage are selected, staked and submitted together, and cleared if either one fails
+        self.coordinator = placement.Coordinator(budget=self.placement_budget, submit=self.submit_wagers,
+                                                 metrics=self.metrics)
+        # Events and markets that were just tried, skipped until their cooldown runs out
+        self.cooldowns = cooldown.Cooldowns()
+
+        # Canonical team or player names, so the same event has the same name on every website
+        self.names = {sport: resolver(sport) for sport in self.sports}
+        self.show_error = False
+
+        # Scanning, looking for arbitrages and placing wagers run as their own tasks
+        # An arbitrage found before its event and market started cooling down is not placed again
+        self.scheduler = scheduler.Scheduler(self.scan, self.evaluate, self.place, self.scan_interval,
+                                             lambda: self.running, lambda key: key[:3] not in self.cooldowns)
+
+    def PrintException(self):
+        exc_type, exc_obj, tb = sys.exc_info()
+        f = tb.tb_frame
+        lineno = tb.tb_lineno
+        filename = f.f_code.co_filename
+        linecache.checkcache(filename)
+        line = linecache.getline(filename, lineno, f.f_globals)
+        print('EXCEPTION IN ({}, LINE {} "{}"): {}'.format(filename, lineno, line.strip(), exc_obj))
+
+    def start(self):
+        self.running = True
+        self.scanning.set()
+
+    def stop(self):
+        self.running = False
+        self.scanning.clear()
+
+    def scrape(self, n, sport):
+        # Find live odds of a sport from the website
+        finder = self.finders[n]
+        try:
+            tic = time.perf_counter()
+            events = finder.events(sport)
+            self.metrics.record('scrape', time.perf_counter() - tic, finder.book.name)
+            tic = time.perf_counter()
+            self.boards[sport][n] = finder.board(events, self.names[sport])
+            self.metrics.record('match', time.perf_counter() - tic, finder.book.name)
+        except Exception as e:
+            if self.show_error:
+                # print(e)
+                self.PrintException()
+            else:
+                pass
+
+    async def scan(self):
+        try:
+            self.show_error = False
+            scan_tic = time.perf_counter()
+
+            if self.workers:
+                # The workers scrape on their own, read the events they changed in the shared odds tables
+                # The boards then hold the prices of each event (see shared_odds.Reader.changes)
+                updated = []
+                for sport, reader in self.readers.items():
+                    for n in range(len(self.workers)):
+                        seconds = reader.scraped(n)
+                        if seconds is not None:
+                            self.metrics.record('scrape', seconds, self.book_names[n])
+                        tic = time.perf_counter()
+                        changes = reader.changes(n)
+                        for event, prices in changes:
+                            if prices is None:
+                                self.boards[sport][n].pop(event, None)
+                                self.tables[sport].clear(n, event)
+                            else:
+                                self.boards[sport][n][event] = prices
+                                self.tables[sport].update_prices(n, event, prices)
+                        if changes:
+                            self.metrics.record('parse', time.perf_counter() - tic, self.book_names[n])
+                            updated.append((n, sport))
+            else:
+                # Find all live wagers for the next sport on every website, in parallel
+                sport = self.rotation.next()
+                await asyncio.gather(*[asyncio.to_thread(self.scrape, n, sport) for n in range(len(self.finders))])
+                updated = [(n, sport) for n in range(len(self.finders))]
+
+                for n, sport in updated:
+                    board = self.boards[sport][n]
+                    tic = time.perf_counter()
+                    self.tables[sport].update_board(n, board)
+                    self.metrics.record('parse', time.perf_counter() - tic, self.book_names[n])
+                    if self.recorder:
+                        # Record the board to replay it later (benchmarks/replay.py), as 'Tennis: FanDuel', so the
+                        # boards of each sport are replayed on their own
+                        self.recorder.write('{}: {}'.format(sport, self.book_names[n]), board)
+
+            # Print the events that are live on more than one website, if they have changed
+            self.scanned = {sport for n, sport in updated}
+            for sport in self.scanned:
+                boards = self.boards[sport]
+                self.new_list = {k for k in set().union(*boards) if sum(k in board for board in boards) > 1}
+                if self.new_list != self.old_lists[sport]:
+                    print(sport, self.new_list, self.names[sport].metrics())
+                    self.old_lists[sport] = self.new_list
+
+            self.metrics.record('scan', time.perf_counter() - scan_tic)
+            self.metrics.flush()
+            self.show_error = True
+        except Exception as e:
+            if self.show_error:
+                # print(e)
+                self.PrintException()
+            else:
+                pass
+
+    def evaluate(self):
+        # Take the best price of each side across all websites, or across each pairing of websites,
+        # and find the arbitrage opportunities. Each board was scraped once and is shared by every pairing
+        # Only the sports of the latest scan are checked, the others are checked after their own scans
+        arbs = dict()
+        self.detected = time.perf_counter()
+        try:
+            for sport, columns in [(sport, columns) for sport in self.scanned for columns in self.columns]:
+                tic = time.perf_counter()
+                checked = self.tables[sport].check(self.main_bet_amount, columns, self.round_decimals)
+                if self.cross_lines:
+                    checked.update(self.tables[sport].cross_lines(self.main_bet_amount, columns, self.round_decimals))
+                self.metrics.record('solve', time.perf_counter() - tic)
+                for key, arb in checked.items():
+                    key = (sport,) + key
+                    # Keep the pairing with the best return, if more than one pairing finds the same arbitrage
+                    if key not in arbs or arb[3] > arbs[key][3]:
+                        arbs[key] = arb
+
+            for key, (legs, prices, result, margin, *middle) in list(arbs.items()):
+                # Both sides need to be on different websites, and the event and market can not be cooling down
+                # Decimal prices back to the positive odds used for the odds limit (i.e. +750)
+                if legs[0] == legs[1] or max(prices) > self.odds_limit / 100 + 1 \
+                        or min(result) < self.bet_limit or margin < self.lower_limit or margin > self.upper_limit \
+                        or key[:3] in self.cooldowns:
+                    del arbs[key]
+        except Exception as e:
+            self.PrintException()
+        return arbs
+
+    def recheck(self, odds):
+        # Check the odds again from the betslips, returns the stake of each wager, or None if the arbitrage is gone
+        self.prices = [odds_math.to_decimal(odds_math.read_wager(text.replace(' ', '').replace(',', '')).american)
+                       for text in odds]
+        self.result, self.return_val, self.make_bet = \
+            odds_math.two_way(self.prices[0], self.prices[1], self.main_bet_amount, self.round_decimals)
+
+        self.result = [float(x) for x in self.result]
+        self.bet_amount = sum(self.result)
+        self.make_bet, self.return_val = bool(self.make_bet), float(self.return_val)
+
+        if self.make_bet and min(self.result) >= self.bet_limit \
+                and (self.return_val / self.bet_amount) >= self.lower_limit \
+                and (self.return_val / self.bet_amount) <= self.upper_limit:
+            return self.result
+        return None
+
+    async def place(self, key, arb):
+        # If there is an opportunity, click both wagers
+        # If the odds have not changed after the wagers have been selected, then enter the stake amounts
+        # If the odds still have not changed, then submit the wagers (when self.submit_wagers is True)
+        # The event and market then cools down, while every other opportunity can still be placed straight away
+        # Each wager is placed in the tab of its sport
+        # A pair of lines is a spread or total across lines, which also returns middle when the score lands between them
+        (sport, k, market, line), (legs, prices, self.result, self.margin, *middle) = key, arb
+        try:
+            if self.workers:
+                # The worker of each sportsbook runs the steps in its own browser
+                wagers = [placement.Leg(self.book_names[n], None, workers.Remote(self.workers[n], sport), k, market,
+                                        side) for side, n in enumerate(legs)]
+            else:
+                wagers = [placement.Leg(self.book_names[n], self.finders[n].driver, self.finders[n].book,
+                                        self.boards[sport][n][k], market, side, self.finders[n].tabs[sport])
+                          for side, n in enumerate(legs)]
+            stopped = await asyncio.to_thread(self.coordinator.place, wagers, self.recheck, self.detected)
+
+            if stopped is None:
+                print(True)
+                print(sport, k, market, line, [self.book_names[n] for n in legs], prices, *middle)
+                print(wagers[0].odds, wagers[1].odds)
+                print(self.return_val)
+                self.cooldowns.add((sport, k, market), self.bet_cooldown * random.randint(1, 1))
+                return
+
+            print(False, stopped)
+            if stopped == 'check':
+                self.cooldowns.add((sport, k, market), self.miss_cooldown)
+        except Exception as e:
+            self.PrintException()
+
+    def run(self):
+        if not self.gui:
+            # Headless, scan from the start until the program is stopped
+            self.start()
+            asyncio.run(self.scheduler.run())
+            return
+
+        # A thin client: the buttons only start and stop the scheduler, which runs in its own thread
+        from tkinter import Tk, Frame, Button
+
+        self.root = Tk()
+        self.root.title("Arb Finder")
+        self.root.geometry("300x100")
+
+        app = Frame(self.root)
+        app.grid()
+
+        start = Button(app, text="Start", command=self.start)
+        stop = Button(app, text="Stop", command=self.stop)
+        start.grid(row=0, column=0, padx=(40, 40), pady=(40, 40))
+        stop.grid(row=0, column=1, padx=(40, 40), pady=(40, 40))
+
+        start.grid()
+        stop.grid()
+
+        self.scheduler.start()
+        self.root.mainloop()
+
+    def unlink(self):
+        # Remove the shared odds tables, the memory goes with the last process that has them open
+        for table in self.odds_tables.values():
+            try:
+                table.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# Create the app and run it
+# Only in the program itself, the worker processes load this file as well (workers.py)
+if __name__ == '__main__':
+    app = App()
+    app.run()
@@ -3,31 +3,55 @@ from gevent import monkey
 
 monkey.patch_all()
 
-import time, logging, sys, linecache, random
+import time, logging, sys, linecache, random, threading
 import undetected_chromedriver as uc
 from tkinter import *
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import StaleElementReferenceException
-from selenium.webdriver.common.keys import Keys
-import nashpy as nash
-import numpy as np
+import blocking
+import board_scripts
+import books
+import browsers
+import cooldown
+import elements
+import latency
+import markets
+import name_resolver
+import odds_feed
+import odds_math
+import odds_store
+import placement
+import tick_log
 
 logging.disable(logging.CRITICAL)
 
+# Stage and website of each step of App.process(), for the latency metrics
+# Steps 1 and 2 record the scrape themselves, and the name matching after it here
+# Placing the wagers is timed by placement.Coordinator
+STEPS = {1: ('match', 'bid'), 2: ('match', 'ask'), 3: ('drain', 'bid'), 4: ('drain', 'ask')}
+
 class ArbFinder(object):
     """docstring for ClassName"""
 
-    def __init__(self, URL):
+    def __init__(self, URL, profile=None, blocked=()):
+        self.started = time.perf_counter()
         try:
             # Setup ChromeDriver
+            # A Chrome profile kept between runs (profile is its folder), or a new one every run (None)
             self.URL = URL
-            self.driver = uc.Chrome()
+            with browsers.launching:
+                self.driver = uc.Chrome(options=blocking.prefs(uc.ChromeOptions(), blocked), user_data_dir=profile)
             # elf.driver.set_window_size(1400, 5000)
-            self.driver.implicitly_wait(5)
+            # No implicit wait, each lookup waits only as long as elements.WAITS says
+            self.driver.implicitly_wait(0)
+            # Images, fonts, media and trackers on the blocklist are never loaded
+            blocking.block(self.driver, blocked)
             self.driver.get(URL)
         except:
             pass
+        # Held by every step of a wager placed in this browser (placement.py)
+        self.lock = threading.Lock()
         self.sport = 'Tennis'
 
     def set_type(self, ASK=0, BID=1):
@@ -38,13 +62,12 @@ class ArbFinder(object):
             if (ASK):
                 # Change to ask view since the default is the bid view
                 self.type = "ASK"
-                self.driver.find_element(By.XPATH,
-                                         "//a[contains(@href,'/live')]//span[text()='" + self.sport + "']").click()
+                elements.find(self.driver, "//a[contains(@href,'/live')]//span[text()='" + self.sport + "']", elements.WAITS['page']).click()
 
             elif (BID):
                 # Nothing to update since the default is the bid view
                 self.type = "BID"
-                self.driver.find_element(By.XPATH, "//a[@role='tab']/span[text()='" + self.sport + "']").click()
+                elements.find(self.driver, "//a[@role='tab']/span[text()='" + self.sport + "']", elements.WAITS['page']).click()
                 time.sleep(1)
                 for elem in self.driver.find_elements(By.XPATH,
                                                       "//div[@aria-label='Featured Accordion' and @aria-expanded='false']//*[@role='img']"):
@@ -52,6 +75,13 @@ class ArbFinder(object):
         except Exception as e:
             print(e)
 
+    def wait_ready(self, name, script):
+        # Report when the board of the sport can be read
+        try:
+            browsers.report(name, self.started, browsers.ready(self.driver, script))
+        except Exception as e:
+            print(e)
+
 
 class App(object):
     def __init__(self):
@@ -65,18 +95,46 @@ class App(object):
         self.upper_limit = 0.070 # Upper arbritage limit to bet on, as a percentage (0.070 = 7%)
         self.bet_limit = 0.10 # Most websites require a minimum of $0.10 a wager on each bet
         self.odds_limit = 750 # The upper odds limit that you want to wager on (i.e. +750)
-
-        self.ask = ArbFinder('https://sportsbook.fanduel.com/live')
-        self.ask.driver.implicitly_wait(5)
-        self.ask.set_type(ASK=1, BID=0)
-        self.running = False
-
-        self.bid = ArbFinder('https://sportsbook.draftkings.com/live')
-        self.bid.driver.implicitly_wait(5)
-        self.bid.set_type(ASK=0, BID=1)
+        self.round_decimals = 2 # Decimal places to round each wager to. Use 0 to round to the dollar
+        self.push_mode = False # Let each website push its odds changes, instead of scraping the whole website every scan
+        self.record = '' # File to record every scraped board to (tick_log.py), i.e. 'boards.log'. Leave empty to not record
+        self.metrics_file = '' # Prometheus text file to write the latency of each stage to, i.e. 'arb.prom'. Leave empty to not write it
+        self.metrics_port = 0 # Serve the latency of each stage on http://localhost:<port>/metrics. Use 0 to not serve it
+        self.submit_wagers = False # Submit the wagers once both stakes are entered. Leave False to stop at the Place Bet buttons
+        self.placement_budget = 15 # Seconds from finding an opportunity to placing both wagers, before both betslips are cleared
+        self.bet_cooldown = 60 # Seconds before wagering on the same event and market again. Every other event is still scanned
+        self.miss_cooldown = 5 # Seconds before trying an event and market again, after its odds moved on the betslip
+        self.profiles = 'profiles/F & D - Two Person' # Folder for the Chrome profile of each website, so logins and cookies carry over. Leave empty for a new profile every run
+        self.blocked = ['images', 'fonts', 'media', 'trackers'] # What the browsers do not load (blocking.py), categories or URL patterns. Leave empty to load whole pages
+
+        def start(URL, name, script, ASK, BID):
+            finder = ArbFinder(URL, browsers.profile(self.profiles, name), self.blocked)
+            finder.set_type(ASK=ASK, BID=BID)
+            finder.wait_ready(name, script)
+            return finder
+
+        # Start both browsers at once
+        self.ask, self.bid = browsers.parallel(
+            lambda: start('https://sportsbook.fanduel.com/live', 'FanDuel', board_scripts.FANDUEL_TWO_PERSON, 1, 0),
+            lambda: start('https://sportsbook.draftkings.com/live', 'DraftKings', board_scripts.DRAFTKINGS_TWO_PERSON, 0, 1))
         self.running = False
 
         self.ignored_exceptions = (NoSuchElementException, StaleElementReferenceException,)
+        self.l1, self.l2, self.bid_deltas, self.ask_deltas = dict(), dict(), None, None
+
+        # Odds of both websites with the version of their last change, so only changed events are checked again
+        self.store, self.checked_version = odds_store.OddsStore(), 0
+        self.recorder = tick_log.TickRecorder(self.record) if self.record else None
+        self.metrics = latency.Metrics(self.metrics_file, self.metrics_port)
+        # Places both wagers of an opportunity together, each step with a deadline
+        self.coordinator = placement.Coordinator(budget=self.placement_budget, submit=self.submit_wagers,
+                                                 metrics=self.metrics)
+        # Events and markets that were just tried, skipped until their cooldown runs out
+        # Events whose cooldown runs out are checked again (expired()), even if their odds did not move
+        self.cooldowns = cooldown.Cooldowns(track=True)
+
+        # Canonical player names, so the same player has the same name on both websites
+        self.names = name_resolver.NameResolver()
 
     def PrintException(self):
         exc_type, exc_obj, tb = sys.exc_info()
@@ -93,141 +151,65 @@ class App(object):
     def stop(self):
         self.running = False
 
-    def process(self, number, looper, bet_amount):
+    def team_name(self, name):
+        return self.names.resolve(name)
+
+    def recheck(self, odds):
+        # Check the odds again from the betslips, returns the stake of each wager, or None if the arbitrage is gone
+        self.ask_wager, self.bid_wager = [odds_math.read_wager(text.replace(' ', '').replace(',', '')).american for text in odds]
+        self.result, self.return_val, self.make_bet = \
+            odds_math.two_way(odds_math.to_decimal(self.ask_wager), odds_math.to_decimal(self.bid_wager),
+                              self.main_bet_amount, self.round_decimals)
+
+        self.result = [float(x) for x in self.result]
+        self.betamount_ask, self.betamount_bid = self.result[0], self.result[1]
+        self.bet_amount = sum(self.result)
+
+        # Make sure both bets have a positive return
+        self.make_bet, self.return_val = bool(self.make_bet), float(self.return_val)
+
+        if self.make_bet and self.betamount_bid >= self.bet_limit \
+                and self.betamount_ask >= self.bet_limit \
+                and (self.return_val / self.bet_amount) >= self.lower_limit \
+                and (self.return_val / self.bet_amount) <= self.upper_limit:
+            return self.result
+        return None
+
+    def process(self, number):
+        tic = time.perf_counter()
         try:
             match number:
                 # Find live odds from the website
                 case 1:
-                    self.bid.results = self.bid.driver.find_elements(By.XPATH,
-                        "//div[contains(@class,'sportsbook-event-accordion__wrapper')]//div[contains(@class,'sportsbook-outcome-cell__body') and not(contains(@class,'disabled'))]/../../../../..")
-                    for n, el in enumerate(self.bid.results):
-                        self.result_bid = self.bid.results[n]
-                        # self.bid.driver.execute_script("arguments[0].scrollIntoView();", self.result_bid)
-
-                        self.xpath_result_bid = self.result_bid.find_elements(By.XPATH, self.find_name)
-                        self.team1_bid, \
-                        self.team2_bid = \
-                            self.xpath_result_bid[0].text.replace('-', ' '), \
-                            self.xpath_result_bid[1].text.replace('-', ' ')
-
-                        self.team1_bid, \
-                        self.team2_bid = \
-                            self.team1_bid.split(' ')[-1], \
-                            self.team2_bid.split(' ')[-1]
-
-                        self.xpath_result_bid = self.result_bid.find_elements(By.XPATH, self.wagers)
-                        self.team1_wagers_bid, \
-                        self.team2_wagers_bid = \
-                            self.xpath_result_bid[0].text, \
-                            self.xpath_result_bid[1].text
-
-                        self.l2[self.team1_bid.lower() + " vs " + self.team2_bid.lower()] = \
-                            [self.team1_wagers_bid.replace('\n', ' '),
-                             self.team2_wagers_bid.replace('\n', ' '),
-                             self.team1_bid,
-                             self.team2_bid]
-                    self.bid.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.CONTROL + Keys.HOME)
+                    self.events_bid = board_scripts.read_board(self.bid.driver, board_scripts.DRAFTKINGS_TWO_PERSON)
+                    self.metrics.record('scrape', time.perf_counter() - tic, 'bid')
+                    tic = time.perf_counter()
+                    for self.event_bid in self.events_bid:
+                        # Keep the player names from the website, they are used to find the wager to click
+                        self.l2[self.team_name(self.event_bid[-2]).lower() + " vs " +
+                                self.team_name(self.event_bid[-1]).lower()] = self.event_bid
+                    books.scroll_to_top(self.bid.driver)
                 # Find live odds from the website
                 case 2:
-                    self.ask.results = self.ask.driver.find_elements(By.XPATH,
-                        "//a[@target='_self' and contains(@title,' ') and contains(.,'live event')]/..//a[@target='_self' and contains(@title,' ') and not(contains(.,'live event'))]/..")
-                    for n, el in enumerate(self.ask.results):
-                        self.result_ask = self.ask.results[n]
-                        # self.ask.driver.execute_script("arguments[0].scrollIntoView();", self.result_ask)
-
-                        self.xpath_result_ask = self.result_ask.find_elements(By.XPATH, self.teams)
-                        self.team1_ask, self.team2_ask = \
-                            self.xpath_result_ask[0].find_element(By.TAG_NAME, 'span').text.replace('-', ' '), \
-                            self.xpath_result_ask[1].find_element(By.TAG_NAME, 'span').text.replace('-', ' ')
-
-                        self.team1_ask, \
-                        self.team2_ask = \
-                            self.team1_ask.split(' ')[-1], \
-                            self.team2_ask.split(' ')[-1]
-
-                        self.xpath_result_ask = self.result_ask.find_elements(By.XPATH, self.second_wagers)
-                        self.team1_wagers_ask, \
-                        self.team2_wagers_ask = \
-                            self.xpath_result_ask[0], \
-                            self.xpath_result_ask[1]
-
-                        self.l1[self.team1_ask.lower() + " vs " + self.team2_ask.lower()] = \
-                            [self.team1_wagers_ask.text.replace('\n', ' '),
-                             self.team2_wagers_ask.text.replace('\n', ' '),
-                             self.team1_ask,
-                             self.team2_ask]
-                # Find the wager to select and click it
+                    self.events_ask = board_scripts.read_board(self.ask.driver, board_scripts.FANDUEL_TWO_PERSON)
+                    self.metrics.record('scrape', time.perf_counter() - tic, 'ask')
+                    tic = time.perf_counter()
+                    for self.event_ask in self.events_ask:
+                        # Keep the player names from the website, they are used to find the wager to click
+                        self.l1[self.team_name(self.event_ask[-2]).lower() + " vs " +
+                                self.team_name(self.event_ask[-1]).lower()] = self.event_ask
+                # Find the odds that have changed since the last scan
                 case 3:
-                    self.wager1 = self.bid.driver.find_elements(By.XPATH,
-                        "//div[contains(@class,'sportsbook-event-accordion__wrapper') and contains(.,'" +
-                        self.wagering[1][2] + "') and contains(.,'" +
-                        self.wagering[1][3] + "')]//div[@class='sportsbook-outcome-cell__elements']/../..")[1 - looper]
-
-                    self.bid.driver.execute_script("arguments[0].scrollIntoView();", self.wager1)
-                    self.wager1.click()
-
-                    self.bid.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.CONTROL + Keys.HOME)
-
-                    while self.bid_wager == '':
-                        self.bid_wager = self.bid.driver.find_element(By.XPATH,
-                            "//div[contains(@class,'betslip-odds__display-standard')]/span").text.strip()
-                # Find the wager to select and click it
+                    self.bid_deltas = odds_feed.drain(self.bid.driver, board_scripts.DRAFTKINGS_TWO_PERSON)
+                # Find the odds that have changed since the last scan
                 case 4:
-                    self.wager2 = self.ask.driver.find_elements(By.XPATH,
-                        "//a[@target='_self' and contains(@title,' ') and contains(.,'live event')]/..//a[@target='_self' and contains(@title,' ') and not(contains(.,'live event')) and contains(.,'" +
-                        self.wagering[0][2] + "') and contains(.,'" +
-                        self.wagering[0][3] + "')]/../div/div")[looper]
-
-                    self.ask.driver.execute_script(
-                        "const mouseoverEvent = new Event('mouseover');arguments[0].dispatchEvent(mouseoverEvent)",
-                        self.wager2)
-
-                    self.ask.driver.execute_script("arguments[0].click();", self.wager2)
-
-                    #self.wager2.click()
-
-                    self.ask.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.CONTROL + Keys.HOME)
-
-                    self.ask_wager = self.ask.driver.find_element(By.XPATH,
-                        "//li//div[contains(@style,'transform')]").text.strip()
-                # Remove all bets, if the odds have changed after the wager was selected
-                case 5:
-                    for elem in self.bid.driver.find_elements(By.XPATH,
-                        "//div[contains(@class,'betslip-outcome-card')]/*[@aria-label='Close' and @role='img']"):
-                        elem.click()
-                # Remove all bets, if the odds have changed after the wager was selected
-                case 6:
-                    for elem in self.ask.driver.find_elements(By.XPATH, "//*[contains(@id,'remove-circle')]/.."):
-                        elem.click()
-                # Enter the stake amount
-                case 7:
-                    self.bet_input_bid = self.bid.driver.find_element(By.XPATH, "//input[@name='stake']")
-                    # self.bet_input_bid.click()
-                    self.bet_input_bid.send_keys(bet_amount)
-                    try:
-                        self.bid_button = self.bid.driver.find_element(By.XPATH, "//div[contains(@class,'place-bet-button__wrapper') and contains(.,'Place Bet')]")
-                    except:
-                        self.bid_button = None
-                # Enter the stake amount
-                case 8:
-                    self.bet_input_ask = self.ask.driver.find_element(By.XPATH, "//span[text()='WAGER']/..//input")
-                    # self.bet_input_ask.click()
-                    self.bet_input_ask.send_keys(bet_amount)
-                    try:
-                        self.ask_button = self.ask.driver.find_element(By.XPATH,"//span[contains(text(),'Place')]/../../../..")
-                    except:
-                        self.ask_button = None
-                # Submit the wager
-                case 9:
-                    self.bid.driver.execute_script("arguments[0].click();", self.bid_button)
-                    #self.bid_button.click()
-                # Submit the wager
-                case 10:
-                    self.ask.driver.execute_script("arguments[0].click();", self.ask_button)
-                    #self.ask_button.click()
+                    self.ask_deltas = odds_feed.drain(self.ask.driver, board_scripts.FANDUEL_TWO_PERSON)
+
+            stage, book = STEPS[number]
+            self.metrics.record(stage, time.perf_counter() - tic, book)
         except Exception as e:
-            self.bid.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.CONTROL + Keys.HOME)
-            self.ask.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.CONTROL + Keys.HOME)
+            books.scroll_to_top(self.bid.driver)
+            books.scroll_to_top(self.ask.driver)
             if self.show_error:
                 #print(e)
                 self.PrintException()
@@ -235,40 +217,62 @@ class App(object):
                 pass
 
     def trading(self):
-        # Bid XPATH
-        self.find_name, self.wagers, self.bets = \
-            ".//div[@class='live-score-body__row--team']", \
-            ".//div[@class='sportsbook-outcome-cell__elements']", \
-            "./../.."
-
-        # Ask XPATH
-        self.teams, self.second_wagers = \
-            "./a/div/div[2]/div[1]", \
-            "./div/div"
-
         if self.running:
             try:
-                # self.tic = time.perf_counter()
-                self.show_error, self.l1, self.l2, self.shared_keys, self.dict_intersection_2 = \
-                    False, dict(), dict(), None, dict()
+                self.scan_tic = time.perf_counter()
+                self.show_error, self.shared_keys, self.dict_intersection_2, self.bid_deltas, self.ask_deltas = \
+                    False, None, dict(), None, None
+
+                if self.push_mode:
+                    # Only collect the odds that have changed on each website since the last scan
+                    self.pool.apply_async(self.process, args=(3,))
+                    self.pool.apply_async(self.process, args=(4,))
+                    # Join the pools so they run in parallel
+                    self.pool.join()
+
+                if self.bid_deltas is None or self.ask_deltas is None:
+                    self.l1, self.l2 = dict(), dict()
+
+                    # Find all live wagers for the sport
+                    self.pool.apply_async(self.process, args=(1,))
+                    self.pool.apply_async(self.process, args=(2,))
+                    # Join the pools so they run in parallel
+                    self.pool.join()
+
+                    self.store.update_board('ask', self.l1)
+                    self.store.update_board('bid', self.l2)
+                else:
+                    self.changed_keys = odds_feed.apply(self.l1, self.ask_deltas, self.team_name) | \
+                                        odds_feed.apply(self.l2, self.bid_deltas, self.team_name)
+
+                    self.store.update_board('ask', self.l1, self.changed_keys)
+                    self.store.update_board('bid', self.l2, self.changed_keys)
 
-                # Find all live wagers for the sport
-                self.pool.apply_async(self.process, args=(1, 0, 0,))
-                self.pool.apply_async(self.process, args=(2, 0, 0,))
-                # Join the pools so they run in parallel
-                self.pool.join()
+                if self.recorder:
+                    # Record both boards to replay them later (benchmarks/replay.py)
+                    self.recorder.write('ask', self.l1)
+                    self.recorder.write('bid', self.l2)
+
+                # Find the events with odds that have changed on either website since they were last checked,
+                # and the events whose cooldown has run out, since their odds may not have changed
+                self.store_version = self.store.version
+                self.changed_keys = self.store.changed_since(self.checked_version) | \
+                                    {key[0] for key in self.cooldowns.expired()}
 
                 #print(self.l1)
                 #print(self.l2)
 
                 # Combine all of the wagers based on the wager name in order to find matches between the websites
                 self.shared_keys = self.l1.keys() & self.l2.keys()
-                self.dict_intersection_2 = {k: [self.l1[k], self.l2[k]] for k in self.shared_keys}
+                # Only the matched wagers that have changed need to be checked again
+                # Each side as a typed event, with the odds and lines already parsed (markets.py)
+                self.dict_intersection_2 = {k: [markets.Event(self.l1[k]), markets.Event(self.l2[k])]
+                                            for k in self.shared_keys & self.changed_keys}
 
                 # Print the latest live matched wagers, if the live matched wagers have changed
                 self.new_list = self.shared_keys
                 if self.new_list != self.old_list:
-                    print(self.new_list)
+                    print(self.new_list, self.names.metrics())
                     self.old_list = self.new_list
                 # print(self.dict_intersection_2)
 
@@ -276,25 +280,23 @@ class App(object):
                 for k in self.dict_intersection_2:
                     self.wagering = self.dict_intersection_2[k]
 
-                    # Convert negative odds to positive values
-                    for i in range(len(self.wagering)):
-                        for j in range(2):  # len(self.wagering[i])
-                            self.wager_val = self.wagering[i][j].replace('−', '-')
+                    # Negative odds as positive values
+                    self.tic = time.perf_counter()
+                    self.ask_odds, self.bid_odds = self.wagering[0].odds()[0], self.wagering[1].odds()[0]
 
-                            if self.wager_val == '':
-                                self.wager_val = 0
-                            else:
-                                self.wager_val = int(float(self.wager_val))
+                    self.metrics.record('parse', time.perf_counter() - self.tic)
 
-                                if self.wager_val < 0:
-                                    self.wager_val = 100 / -self.wager_val * 100
-                                else:
-                                    self.wager_val = self.wager_val  # / 100
-
-                            self.wagering[i][j] = self.wager_val
-
-                    # self.toc = time.perf_counter()
-                    # print(self.toc - self.tic)
+                    # Find the wager amounts and returns for both sides of the event in one call
+                    self.tic = time.perf_counter()
+                    self.ask_prices, self.bid_prices = \
+                        odds_math.cross_sides(odds_math.to_decimal(self.ask_odds),
+                                              odds_math.to_decimal(self.bid_odds))
+                    self.metrics.record('convert', time.perf_counter() - self.tic)
+                    self.tic = time.perf_counter()
+                    self.stakes, self.returns, self.arbs = \
+                        odds_math.two_way(self.ask_prices, self.bid_prices, self.main_bet_amount, self.round_decimals)
+                    self.metrics.record('solve', time.perf_counter() - self.tic)
+                    self.detected = time.perf_counter()
 
                     # Using the Nash equilibrium, find if there are arbitrage opportunities
                     # If there are opportunities, click the wagers
@@ -303,130 +305,47 @@ class App(object):
                     for i in range(2):
                         self.make_bet = True
 
-                        if self.wagering[0][i] <= self.odds_limit and self.wagering[1][1 - i] <= self.odds_limit:
-                            self.A = np.array([[self.wagering[0][i], -100],
-                                               [-100, self.wagering[1][1 - i]]])
-
-                            self.rps = nash.Game(self.A)
-
-                            self.eqs = self.rps.support_enumeration()
-                            self.result = list(self.eqs)[0][0]
+                        if self.ask_odds[i] <= self.odds_limit and self.bid_odds[1 - i] <= self.odds_limit:
+                            self.result = [float(x) for x in self.stakes[i]]
                             # print(self.result)
 
-                            self.bet_amount = self.main_bet_amount
-                            self.result = self.bet_amount * self.result
-                            self.result = [round(x, 2) for x in self.result]
                             self.betamount_ask, self.betamount_bid = self.result[0], self.result[1]
-
-                            self.bet_amount, self.sum_val = sum(self.result), 0
-                            # print(self.result)
+                            self.bet_amount = sum(self.result)
 
                             # Make sure both bets have a positive return
-                            for m in range(len(self.result)):
-                                if (self.result[m] * self.A[m][m] / 100 + self.result[m]) <= self.bet_amount:
-                                    self.make_bet = False
-                                self.sum_val += sum(self.result[m] * self.A[m])
-
-                            self.return_val = self.sum_val / len(self.result) / 100
+                            self.make_bet = bool(self.arbs[i])
+                            self.return_val = float(self.returns[i])
 
                             if self.make_bet and self.betamount_bid >= self.bet_limit \
                                     and self.betamount_ask >= self.bet_limit \
                                     and (self.return_val / self.bet_amount) >= self.lower_limit \
-                                    and (self.return_val / self.bet_amount) <= self.upper_limit:
-                                self.bid_wager, self.ask_wager = '', ''
-
-                                self.pool.apply_async(self.process, args=(3, i, 0,))
-                                self.pool.apply_async(self.process, args=(4, i, 0,))
-                                # Join the pools so they run in parallel
-                                self.pool.join()
-
-                                self.bid_wager, self.ask_wager = \
-                                    self.bid_wager.replace(' ', '').replace(',', '').replace('−', '-'), \
-                                    self.ask_wager.replace(' ', '').replace(',', '').replace('−', '-')
-
-                                if self.bid_wager == '':
-                                    self.bid_wager = 0
-
-                                if self.ask_wager == '':
-                                    self.ask_wager = 0
-
-                                self.bid_wager, self.ask_wager = \
-                                    int(float(self.bid_wager)), int(float(self.ask_wager))
-
-                                if self.bid_wager < 0:
-                                    self.bid_wager = -100 / self.bid_wager * 100
-                                elif self.ask_wager < 0:
-                                    self.ask_wager = -100 / self.ask_wager * 100
-
-                                self.A = np.array([[self.ask_wager, -100],
-                                                   [-100, self.bid_wager]])
-
-                                self.rps = nash.Game(self.A)
-
-                                self.eqs = self.rps.support_enumeration()
-                                self.result = list(self.eqs)[0][0]
-                                # print(self.result)
-
-                                self.bet_amount = self.main_bet_amount
-                                self.result = self.bet_amount * self.result
-                                self.result = [round(x, 2) for x in self.result]
-                                self.betamount_ask, self.betamount_bid = self.result[0], self.result[1]
-
-                                self.bet_amount, self.sum_val = sum(self.result), 0
-                                # print(self.result)
-
-                                for m in range(len(self.result)):
-                                    if (self.result[m] * self.A[m][m] / 100 + self.result[m]) <= self.bet_amount:
-                                        self.make_bet = False
-                                    self.sum_val += sum(self.result[m] * self.A[m])
-
-                                self.return_val = self.sum_val / len(self.result) / 100
-
-                                self.bid_button, self.ask_button = None, None
-
-                                if self.make_bet and self.betamount_bid >= self.bet_limit \
-                                        and self.betamount_ask >= self.bet_limit \
-                                        and (self.return_val / self.bet_amount) >= self.lower_limit \
-                                        and (self.return_val / self.bet_amount) <= self.upper_limit:
-                                    self.pool.apply_async(self.process, args=(7, 0, self.betamount_bid,))
-                                    self.pool.apply_async(self.process, args=(8, 0, self.betamount_ask,))
-                                    # Join the pools so they run in parallel
-                                    self.pool.join()
-
-                                    if self.ask_button != None and self.ask_button != None:
-                                        '''
-                                        self.pool.apply_async(self.process, args=(9, 0, 0,))
-                                        self.pool.apply_async(self.process, args=(10, 0, 0,))
-                                        # Join the pools so they run in parallel
-                                        self.pool.join()
-                                        '''
-
-                                        print(True)
-                                        print(k, self.wagering)
-                                        print(self.bid_wager, self.ask_wager)
-                                        print(self.return_val)
-                                        time.sleep(60 * random.randint(1, 1))
-                                    else:
-                                        #time.sleep(5)
-
-                                        self.pool.apply_async(self.process, args=(5, 0, 0,))
-                                        self.pool.apply_async(self.process, args=(6, 0, 0,))
-                                        # Join the pools so they run in parallel
-                                        self.pool.join()
-
-                                        print(False)
+                                    and (self.return_val / self.bet_amount) <= self.upper_limit \
+                                    and (k, 0) not in self.cooldowns:
+                                # Select, check, stake and submit both wagers together. If either website is too slow, fails, or the
+                                # odds have moved, both betslips are cleared
+                                self.legs = [placement.Leg('ask', self.ask.driver, books.BOOKS['FanDuel'], self.l1[k], 0, i, self.ask.lock),
+                                             placement.Leg('bid', self.bid.driver, books.BOOKS['DraftKings'], self.l2[k], 0, 1 - i, self.bid.lock)]
+                                self.stopped = self.coordinator.place(self.legs, self.recheck, self.detected)
+
+                                if self.stopped is None:
+                                    print(True)
+                                    print(k, self.wagering)
+                                    print(self.legs[1].odds, self.legs[0].odds)
+                                    print(self.return_val)
+                                    self.cooldowns.add((k, 0), self.bet_cooldown * random.randint(1, 1))
                                 else:
-                                    time.sleep(5)
+                                    if self.stopped in ['select', 'check']:
+                                        self.cooldowns.add((k, 0), self.miss_cooldown)
+                                    print(False, self.stopped)
 
-                                    self.pool.apply_async(self.process, args=(5, 0, 0,))
-                                    self.pool.apply_async(self.process, args=(6, 0, 0,))
-                                    # Join the pools so they run in parallel
-                                    self.pool.join()
+                # Every changed event has been checked
+                self.checked_version = self.store_version
 
-                                    print(False)
+                self.metrics.record('scan', time.perf_counter() - self.scan_tic)
+                self.metrics.flush()
             except Exception as e:
-                self.bid.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.CONTROL + Keys.HOME)
-                self.ask.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.CONTROL + Keys.HOME)
+                books.scroll_to_top(self.bid.driver)
+                books.scroll_to_top(self.ask.driver)
                 if self.show_error:
                     # print(e)
                     self.PrintException()
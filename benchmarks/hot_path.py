@@ -0,0 +1,157 @@
+import copy
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import line_ladder
+import markets
+import name_resolver
+import odds_math
+import tick_log
+
+# The pure Python work App.trading() does for every scan, on boards of increasing size:
+#   cold   - the typed events (markets.py) of the matched events, and their odds with the lines compared,
+#            with nothing cached, as on the first scan, so a slower wager parser shows up here
+#   parse  - the same on wager texts it has seen before, as on every other scan
+#   match  - the board keys from the team names, l1.keys() & l2.keys() and the dict of matched events
+#   solve  - the odds conversion and the wagers and returns of every market and side
+# Run from the top folder of the repository:
+#   python -m benchmarks.hot_path                 generated baseball boards of 10, 100 and 1000 events
+#   python -m benchmarks.hot_path boards.log      also the boards of a recorded tick log (benchmarks/replay.py)
+# Every run is appended to benchmarks/results/hot_path.jsonl and compared with the run before it
+
+SIZES, REPEATS = [10, 100, 1000], 7
+RESULTS = os.path.join(os.path.dirname(__file__), 'results', 'hot_path.jsonl')
+
+
+def random_board(events, seed):
+    # Baseball boards in the l1 / l2 shape, with the same events on both websites
+    rng = random.Random(seed)
+    board = dict()
+    for n in range(events):
+        favourite, line = rng.randint(110, 250), rng.choice([7.5, 8.5, 9.5])
+        board['team{} vs team{}'.format(n, n + events)] = [
+            ['+1.5 −{}'.format(rng.randint(110, 200)), '-1.5 +{}'.format(rng.randint(100, 180))],
+            ['−{}'.format(favourite), '+{}'.format(favourite - rng.randint(5, 30))],
+            ['O {:g} −{}'.format(line, rng.randint(100, 120)), 'U {:g} −{}'.format(line, rng.randint(100, 120))],
+            'Team {}'.format(n), 'Team {}'.format(n + events)]
+    return board
+
+
+def parse(wagering):
+    # As in the baseball App.trading(), keep it in step with the program
+    # The wager texts repeat from scan to scan, so most outcomes come parsed from the cache of odds_math.read_wager()
+    ask, bid = markets.Event(wagering[0]), markets.Event(wagering[1])
+    ask_odds, bid_odds = ask.odds(), bid.odds()
+    for q in [markets.SPREAD, markets.TOTAL]:
+        for i in range(2):
+            ask_line, bid_line = ask[q][i].line, bid[q][1 - i].line
+            if not (line_ladder.covers(q, ask_line, bid_line) if i == 0 else line_ladder.covers(q, bid_line, ask_line)):
+                ask_odds[q][i], bid_odds[q][1 - i] = 0, 0
+    return [ask_odds, bid_odds]
+
+
+def parse_two_person(wagering):
+    # As in the two person App.trading(), keep it in step with the program
+    return [markets.Event(wagering[0]).odds()[0], markets.Event(wagering[1]).odds()[0]]
+
+
+def match(events1, events2, names):
+    l1 = {names.resolve(event[-2]).lower() + ' vs ' + names.resolve(event[-1]).lower(): event for event in events1}
+    l2 = {names.resolve(event[-2]).lower() + ' vs ' + names.resolve(event[-1]).lower(): event for event in events2}
+    return {k: [l1[k], l2[k]] for k in l1.keys() & l2.keys()}
+
+
+def solve(matched, markets):
+    for wagering in matched.values():
+        ask, bid = odds_math.cross_sides(odds_math.to_decimal(wagering[0][:markets]),
+                                         odds_math.to_decimal(wagering[1][:markets]))
+        odds_math.two_way(ask, bid, 100)
+
+
+def cold(parser, matched):
+    odds_math.read_wager.cache_clear()
+    return [parser(wagering) for wagering in matched.values()]
+
+
+def timed(function, *args):
+    # Seconds per call: the fastest of the repeats, the least disturbed by the rest of the machine
+    # Each repeat makes enough calls to last about 50 ms, every call on a fresh copy of the arguments
+    tic = time.perf_counter()
+    function(*copy.deepcopy(args))
+    number = max(int(0.05 / (time.perf_counter() - tic)), 1)
+
+    times = []
+    for repeat in range(REPEATS):
+        fresh = [copy.deepcopy(args) for call in range(number)]
+        tic = time.perf_counter()
+        for arguments in fresh:
+            function(*arguments)
+        times.append((time.perf_counter() - tic) / number)
+    return min(times)
+
+
+def run(name, events1, events2):
+    two_person = not isinstance(events1[0][0], list)
+    names = name_resolver.NameResolver(None if two_person else name_resolver.MLB_TEAMS)
+    matched = match(events1, events2, names)
+    parser = parse_two_person if two_person else parse
+    parsed = {k: parser(copy.deepcopy(wagering)) for k, wagering in matched.items()}
+
+    results = dict()
+    for stage, seconds in [('cold', timed(cold, parser, matched)),
+                           ('parse', timed(lambda m: [parser(w) for w in m.values()], matched)),
+                           ('match', timed(match, events1, events2, names)),
+                           ('solve', timed(solve, parsed, 1 if two_person else 3))]:
+        count = max(len(matched), 1)
+        results[stage] = {'events': len(matched), 'events_per_second': count / seconds,
+                          'us_per_event': seconds / count * 1e6}
+        print('{:<16} {:<6} {:6d} events {:12.0f} events/s {:9.2f} us/event'.format(
+            name, stage, len(matched), count / seconds, seconds / count * 1e6))
+    return results
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+results = dict()
+for size in SIZES:
+    boards = [list(random_board(size, seed).values()) for seed in [1, 2]]
+    results['generated {}'.format(size)] = run('generated {}'.format(size), *boards)
+
+if len(sys.argv) > 1:
+    # The last board of the first two books in the log
+    latest = dict()
+    for seconds, book, events in tick_log.read(sys.argv[1]):
+        latest[book] = events
+    if len(latest) > 1:
+        results['recorded'] = run('recorded', *list(latest.values())[:2])
+
+# Compare with the last saved run, then save this one
+previous = None
+if os.path.exists(RESULTS):
+    with open(RESULTS) as file:
+        lines = file.read().splitlines()
+    previous = json.loads(lines[-1]) if lines else None
+
+if previous:
+    print('\nChange since {} ({})'.format(previous['time'], previous['commit'] or 'no commit'))
+    for board, stages in results.items():
+        for stage, result in stages.items():
+            before = previous['results'].get(board, dict()).get(stage)
+            if before:
+                print('{:<16} {:<6} {:+7.1f}% us/event'.format(
+                    board, stage, (result['us_per_event'] / before['us_per_event'] - 1) * 100))
+
+os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+with open(RESULTS, 'a') as file:
+    file.write(json.dumps({'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'commit': commit(),
+                           'python': platform.python_version(), 'results': results}) + '\n')
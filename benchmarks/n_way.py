@@ -0,0 +1,39 @@
+import time
+import numpy as np
+
+import odds_math
+
+# Time odds_math.n_way on boards of multi-outcome markets from several books
+# Run from the top folder of the repository: python -m benchmarks.n_way
+
+bet_amount = 100
+repeats = 200
+
+
+def random_markets(count, books=3, seed=0):
+    # Two way, three way (soccer) and five runner futures markets, each book with its own margin
+    rng = np.random.default_rng(seed)
+    markets = []
+    for n in range(count):
+        fair = rng.dirichlet(np.ones(rng.choice([2, 3, 5])))
+        markets.append(1 / (fair * (1 + rng.uniform(-0.01, 0.07, size=(books, len(fair))))))
+    return odds_math.pad(markets)
+
+
+# Two outcome markets from two books must give the same answer as odds_math.two_way
+prices, outcomes = odds_math.pad([[[2.65, 1.5], [1.4, 2.4]], [[1.9, 1.9], [1.95, 1.85]]])
+best_book, best_price, stakes, margin, is_arb = odds_math.n_way(prices, bet_amount, outcomes)
+two_stakes, two_profit, two_arb = odds_math.two_way(best_price[:, 0], best_price[:, 1], bet_amount)
+assert np.allclose(stakes, two_stakes) and (is_arb == two_arb).all()
+
+for count in [10, 100, 500, 1000]:
+    prices, outcomes = random_markets(count)
+    odds_math.n_way(prices, bet_amount, outcomes)
+
+    tic = time.perf_counter()
+    for r in range(repeats):
+        best_book, best_price, stakes, margin, is_arb = odds_math.n_way(prices, bet_amount, outcomes)
+    per_call = (time.perf_counter() - tic) / repeats
+
+    print('{:>5} markets: {:7.3f} ms per board, {:6.3f} us per market, {} arbitrages'.format(
+        count, per_call * 1000, per_call / count * 1e6, int(is_arb.sum())))
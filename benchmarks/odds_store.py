@@ -0,0 +1,63 @@
+import copy
+import random
+import time
+
+import odds_math
+import odds_store
+
+# Per scan work with and without odds_store, on a board of live events where only a few prices move each scan
+# Run from the top folder of the repository: python -m benchmarks.odds_store
+
+events, moving, scans = 150, 3, 200
+
+
+def random_board(seed):
+    rng = random.Random(seed)
+    return {'team{} vs team{}'.format(n, n + 1000): [str(rng.choice([-1, 1]) * rng.randint(100, 300)),
+                                                      str(rng.choice([-1, 1]) * rng.randint(100, 300)),
+                                                      'team' + str(n), 'team' + str(n + 1000)]
+            for n in range(events)}
+
+
+def check(wagering):
+    # The odds conversion and solve App.trading() runs for every matched event
+    prices = [[odds_math.to_decimal(int(float(wager))) for wager in board[:2]] for board in wagering]
+    return odds_math.two_way(*odds_math.cross_sides(prices[0], prices[1]), 100)
+
+
+def scan(l1, l2, store, checked_version):
+    if store is not None:
+        store.update_board('ask', l1)
+        store.update_board('bid', l2)
+        changed = store.changed_since(checked_version)
+    else:
+        changed = l1.keys() | l2.keys()
+
+    for k in l1.keys() & l2.keys() & changed:
+        check(copy.deepcopy([l1[k], l2[k]]))
+    return len(l1.keys() & l2.keys() & changed)
+
+
+for incremental in [False, True]:
+    l1, l2, rng = random_board(1), random_board(2), random.Random(3)
+    store = odds_store.OddsStore() if incremental else None
+    checked, elapsed, checked_events = 0, 0, 0
+
+    for n in range(scans + 1):
+        # The websites are scraped again every scan, only a few prices move
+        l1, l2 = copy.deepcopy(l1), copy.deepcopy(l2)
+        for m in range(moving):
+            board = rng.choice([l1, l2])
+            board[rng.choice(list(board))][rng.randint(0, 1)] = str(rng.randint(100, 300))
+
+        tic = time.perf_counter()
+        count = scan(l1, l2, store, checked)
+        if store is not None:
+            checked = store.version
+
+        # The first scan checks every event either way
+        if n > 0:
+            elapsed, checked_events = elapsed + time.perf_counter() - tic, checked_events + count
+
+    print('{:<12} {:8.3f} ms per scan, {:6.1f} events checked per scan'.format(
+        'odds_store' if incremental else 'full board', elapsed / scans * 1000, checked_events / scans))
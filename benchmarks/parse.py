@@ -0,0 +1,88 @@
+import random
+import time
+
+import numpy as np
+
+import odds_math
+import odds_store
+
+# Parsing every wager of a board into its line and odds, on baseball boards of 10, 100 and 1000 events:
+#   trading - one wager at a time with split, pop, join, replace and int(float()), the code App.trading() had
+#   cold    - odds_math.parse_wagers() with nothing cached, as on the first scan
+#   warm    - odds_math.parse_wagers() on a board it has seen before, as on every other scan
+# The boards have no EVEN, which App.trading() could not read
+# Run from the top folder of the repository: python -m benchmarks.parse
+
+SIZES, REPEATS = [10, 100, 1000], 7
+
+
+def random_board(events, seed):
+    # Baseball boards in the l1 / l2 shape, with Unicode minus signs, lower case totals and disabled wagers
+    rng = random.Random(seed)
+
+    def odds():
+        return rng.choice(['−{}'.format(rng.randint(100, 250)), '+{}'.format(rng.randint(100, 250))])
+
+    board = dict()
+    for n in range(events):
+        line = rng.choice([7.5, 8.5, 9, 9.5])
+        wagers = [['+1.5 ' + odds(), '-1.5 ' + odds()], [odds(), odds()],
+                  [rng.choice(['O ', 'o']) + '{:g} '.format(line) + odds(),
+                   rng.choice(['U ', 'u']) + '{:g} '.format(line) + odds()]]
+        if rng.random() < 0.1:
+            wagers[rng.randrange(3)] = ['', '']
+        board['team{} vs team{}'.format(n, n + events)] = wagers + ['Team {}'.format(n), 'Team {}'.format(n + events)]
+    return board
+
+
+def trading(texts):
+    # The line text and positive odds of every wager, as App.trading() read them
+    lines, odds = [], []
+    for text in texts:
+        wager_val_text = text.split(' ')
+        wager_val = wager_val_text[-1].replace('−', '-')
+        wager_val_text.pop()
+        wager_val_text = ' '.join(wager_val_text)
+        lines.append(wager_val_text.replace(' ', '')[1:])
+        if wager_val == '':
+            wager_val = 0
+        else:
+            wager_val = int(float(wager_val))
+            if wager_val < 0:
+                wager_val = 100 / -wager_val * 100
+        odds.append(wager_val)
+    return lines, odds
+
+
+def cold(texts):
+    odds_math.read_wager.cache_clear()
+    return odds_math.parse_wagers(texts)
+
+
+def timed(function, texts):
+    # Seconds per board: the fastest of the repeats, each repeat lasting about 50 ms
+    tic = time.perf_counter()
+    function(texts)
+    number = max(int(0.05 / (time.perf_counter() - tic)), 1)
+
+    times = []
+    for repeat in range(REPEATS):
+        tic = time.perf_counter()
+        for call in range(number):
+            function(texts)
+        times.append((time.perf_counter() - tic) / number)
+    return min(times)
+
+
+for size in SIZES:
+    texts = [wager for event in random_board(size, 1).values() for market, side, wager in odds_store.cells(event)]
+
+    # Both read the same odds
+    line, american, decimal, implied = cold(texts)
+    assert np.allclose(trading(texts)[1], [odds_math.read_wager(text).odds for text in texts])
+    assert np.array_equal(np.isnan(decimal), [text == '' for text in texts])
+
+    for name, function in [('trading', trading), ('cold', cold), ('warm', odds_math.parse_wagers)]:
+        seconds = timed(function, texts)
+        print('{:<5} events {:<8} {:6d} wagers {:10.1f} us per board {:7.3f} us per wager'.format(
+            size, name, len(texts), seconds * 1e6, seconds / len(texts) * 1e6))
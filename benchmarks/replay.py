@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+import best_line
+import name_resolver
+import tick_log
+
+# Replay a recorded tick log through name matching and the best line table, the same path a scan takes
+# after the boards are read, and time it without the websites
+# Run from the top folder of the repository:
+#   python -m benchmarks.replay                  a generated log, as fast as possible
+#   python -m benchmarks.replay boards.log       a recorded log (self.record in the programs)
+#   python -m benchmarks.replay boards.log 1     a recorded log at the speed it was recorded
+# The number of arbitrages found is the same on every run of the same log
+
+books, events, ticks = ['FanDuel', 'DraftKings'], 100, 400
+
+
+def prices(rng, n):
+    # A favourite and an underdog with the usual margin, so an arbitrage needs the books to disagree
+    favourite = 110 + n * 37 % 190 + rng.randint(-5, 5)
+    return ['-' + str(favourite), '+' + str(favourite - rng.randint(5, 40))][::1 if n % 2 else -1]
+
+
+def generate(path, seed=1):
+    # Tennis boards for two books, where a few events move every tick
+    rng = random.Random(seed)
+    boards = {book: [prices(rng, n) + ['Player {}'.format(n), 'Player {}'.format(n + 1000)] for n in range(events)]
+              for book in books}
+
+    recorder = tick_log.TickRecorder(path)
+    for tick in range(ticks):
+        book = books[tick % len(books)]
+        for n in rng.sample(range(events), 3):
+            boards[book][n][:2] = prices(rng, n)
+        recorder.write(book, boards[book])
+    recorder.close()
+
+
+def sport(book):
+    # All Books records the boards of each sport as 'Tennis: FanDuel', the other programs by book only
+    return book.rpartition(': ')[0]
+
+
+def run(path, speed=None):
+    # A table per sport, with one column per book of that sport in the log
+    books = list(dict.fromkeys(book for seconds, book, wagers in tick_log.read(path)))
+    columns = {book: [other for other in books if sport(other) == sport(book)].index(book) for book in books}
+    tables = {sport(book): best_line.BestLineTable([other for other in books if sport(other) == sport(book)])
+              for book in books}
+    names = {sport(book): name_resolver.NameResolver() for book in books}
+    latencies, arbs = [], set()
+
+    for seconds, book, wagers in tick_log.replay(path, speed):
+        tic = time.perf_counter()
+
+        resolve = names[sport(book)].resolve
+        board = {resolve(event[-2]).lower() + ' vs ' + resolve(event[-1]).lower(): event for event in wagers}
+        table = tables[sport(book)]
+        table.update_board(columns[book], board)
+        arbs |= {(sport(book),) + key for key in table.check(100)}
+
+        latencies.append(time.perf_counter() - tic)
+
+    latencies.sort()
+    print('{} ticks, {:8.0f} ticks/s, p50 {:.3f} ms, p99 {:.3f} ms, {} arbitrages'.format(
+        len(latencies), len(latencies) / sum(latencies), latencies[len(latencies) // 2] * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000, len(arbs)))
+
+
+if len(sys.argv) > 1:
+    run(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else None)
+else:
+    path = os.path.join(tempfile.mkdtemp(), 'boards.log')
+    generate(path)
+    print('{:.1f} KB log'.format(os.path.getsize(path) / 1024))
+    run(path)
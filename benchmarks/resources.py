@@ -0,0 +1,51 @@
+import sys
+import time
+
+import psutil
+from selenium import webdriver
+
+import blocking
+import books
+import browsers
+
+# Memory and reload time of one Chrome on a simulator page, loading the whole page and with the blocklist
+# Start the simulator with its page assets first, then run from the top folder of the repository (needs Chrome
+# and psutil):
+#   python simulator.py --events 200 --assets
+#   python -m benchmarks.resources FanDuel Baseball
+# Memory is the resident set (RSS) of every Chrome process of the browser, after the page has loaded and settled
+
+URL = 'http://localhost:8001'
+PAGES = {'DraftKings': 'draftkings', 'FanDuel': 'fanduel', 'William Hill': 'williamhill'}
+name = sys.argv[1] if len(sys.argv) > 1 else 'FanDuel'
+sport = sys.argv[2] if len(sys.argv) > 2 else 'Baseball'
+book, reloads = books.BOOKS[name], 10
+script = book.board_script(sport != 'Baseball')
+
+
+def rss(driver):
+    # chromedriver starts Chrome, and Chrome starts a process per renderer, GPU and network service
+    processes = psutil.Process(driver.service.process.pid).children(recursive=True)
+    return sum(process.memory_info().rss for process in processes if process.is_running())
+
+
+for label, blocked in [('whole page', []), ('blocked', blocking.DEFAULT)]:
+    options = blocking.prefs(webdriver.ChromeOptions(), blocked)
+    options.add_argument('--headless=new')
+    driver = webdriver.Chrome(options=options)
+    blocking.block(driver, blocked)
+    driver.get(URL + '/' + PAGES[name] + '/live')
+    browsers.ready(driver, script)
+
+    times = []
+    for n in range(reloads):
+        tic = time.perf_counter()
+        driver.refresh()
+        browsers.ready(driver, script)
+        times.append(time.perf_counter() - tic)
+    times.sort()
+
+    time.sleep(2)
+    print('{:<11} {:7.1f} MB, reload p50 {:7.1f} ms, max {:7.1f} ms'.format(
+        label, rss(driver) / 1e6, times[len(times) // 2] * 1000, times[-1] * 1000))
+    driver.quit()
@@ -0,0 +1,61 @@
+import copy
+import pickle
+import random
+import time
+
+import best_line
+import shared_odds
+
+# Moving a board from a worker process to the engine, per scan: pickling the whole board (what a pipe does) against
+# writing the events that changed into a shared_odds table and reading them back. Both end in the engine's table
+# Run from the top folder of the repository: python -m benchmarks.shared_odds
+
+events, moving, scans = 500, 5, 400
+
+
+def random_wager(rng, line=''):
+    return (line + ' ' if line else '') + '{:+d}'.format(rng.choice([-1, 1]) * rng.randint(100, 300))
+
+
+def random_event(rng, n):
+    return [[random_wager(rng, '+1.5'), random_wager(rng, '-1.5')], [random_wager(rng), random_wager(rng)],
+            [random_wager(rng, 'O 8.5'), random_wager(rng, 'U 8.5')], 'Team' + str(n), 'Team' + str(n + 1000)]
+
+
+rng = random.Random(1)
+board = {'team{} vs team{}'.format(n, n + 1000): random_event(rng, n) for n in range(events)}
+boards = []
+for n in range(scans):
+    # The website is scraped again every scan, only a few prices move
+    board = copy.deepcopy(board)
+    for m in range(moving):
+        event = board[rng.choice(list(board))]
+        market = rng.randint(0, 2)
+        event[market][rng.randint(0, 1)] = random_wager(rng, ['+1.5', '', 'O 8.5'][market])
+    boards.append(board)
+
+# Pipe: the whole board is pickled by the worker and unpickled by the engine, then the engine parses it
+table, elapsed, size = best_line.BestLineTable(['book']), 0, 0
+for board in boards:
+    tic = time.perf_counter()
+    data = pickle.dumps(board, pickle.HIGHEST_PROTOCOL)
+    table.update_board(0, pickle.loads(data))
+    elapsed, size = elapsed + time.perf_counter() - tic, size + len(data)
+print('{:<12} {:8.3f} ms per scan, {:8.1f} KB sent per scan'.format('pickle', elapsed / scans * 1000,
+                                                                    size / scans / 1000))
+
+# Shared memory: the worker parses and writes the events that changed, the engine reads only those
+odds = shared_odds.OddsTable(1, events)
+writer, reader, table = shared_odds.Writer(odds, 0), shared_odds.Reader(odds), best_line.BestLineTable(['book'])
+elapsed, written = 0, 0
+for board in boards:
+    tic = time.perf_counter()
+    written += writer.write(board)
+    for event, prices in reader.changes(0):
+        table.update_prices(0, event, prices)
+    elapsed += time.perf_counter() - tic
+print('{:<12} {:8.3f} ms per scan, {:8.1f} events written per scan'.format('shared_odds', elapsed / scans * 1000,
+                                                                         written / scans))
+del writer, reader
+odds.close()
+odds.unlink()
@@ -0,0 +1,81 @@
+import json
+import sys
+import time
+import urllib.request
+
+from selenium import webdriver
+
+import board_scripts
+import books
+import name_resolver
+
+# Scan latency, matching accuracy, placement time and how fast a missing element fails, against the local sportsbook simulator
+# Start the simulator first, then run from the top folder of the repository (needs Chrome):
+#   python simulator.py --sport Tennis --events 500
+#   python -m benchmarks.simulator Tennis
+# The simulator's own list of events is the truth the matched names are checked against
+
+URL = 'http://localhost:8001'
+PAGES = {'DraftKings': 'draftkings', 'FanDuel': 'fanduel', 'William Hill': 'williamhill'}
+sport = sys.argv[1] if len(sys.argv) > 1 else 'Baseball'
+two_person, scans = sport != 'Baseball', 20
+
+
+def get(path):
+    return json.loads(urllib.request.urlopen(URL + path).read())
+
+
+options = webdriver.ChromeOptions()
+options.add_argument('--headless=new')
+names, truth = name_resolver.NameResolver(None if two_person else name_resolver.MLB_TEAMS), get('/events')
+keys = dict()
+
+for name, page in PAGES.items():
+    book = books.BOOKS[name]
+    if book.board_script(two_person) is None:
+        continue
+
+    driver = webdriver.Chrome(options=options)
+    driver.get(URL + '/' + page + '/live')
+    book.open_sport(driver, sport)
+
+    latencies = []
+    for n in range(scans):
+        tic = time.perf_counter()
+        board = board_scripts.read_board(driver, book.board_script(two_person))
+        latencies.append(time.perf_counter() - tic)
+    latencies.sort()
+    print('{:<13} {:5d} events, scan p50 {:7.1f} ms, max {:7.1f} ms'.format(
+        name, len(board), latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000))
+
+    keys[page] = [names.resolve(event[page][0]).lower() + ' vs ' + names.resolve(event[page][1]).lower()
+                  for event in truth]
+    scraped = {names.resolve(event[-2]).lower() + ' vs ' + names.resolve(event[-1]).lower() for event in board}
+    print('{:<13} {:5.1f}% of the events read and matched'.format(
+        '', 100 * sum(key in scraped for key in keys[page]) / len(truth)))
+
+    # Select the first wager that is not disabled, enter a stake and place it
+    for event in board:
+        market = 0 if two_person else 1
+        if (event[0] if two_person else event[1][0]) == '':
+            continue
+        tic = time.perf_counter()
+        book.select(driver, event, market, 0)
+        book.submit(driver, book.stake(driver, 1))
+        print('{:<13} placed in {:7.1f} ms'.format('', (time.perf_counter() - tic) * 1000))
+        break
+
+    # A wager of an event that is no longer on the page fails after its explicit wait (elements.WAITS)
+    tic = time.perf_counter()
+    try:
+        book.select(driver, ['', '', 'No Team', 'Other Team'] if two_person else [[], [], [], 'No Team', 'Other Team'], 1, 0)
+    except Exception:
+        pass
+    print('{:<13} missing event failed in {:7.1f} ms'.format('', (time.perf_counter() - tic) * 1000))
+    driver.quit()
+
+# The same event needs the same key on every book
+pages = list(keys)
+agree = sum(len({keys[page][n] for page in pages}) == 1 for n in range(len(truth)))
+print('{:.1f}% of {} events have the same key on {}'.format(100 * agree / len(truth), len(truth), ', '.join(pages)))
+print('{} wagers placed on the simulator'.format(len(get('/bets'))))
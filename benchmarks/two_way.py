@@ -0,0 +1,74 @@
+import time
+import nashpy as nash
+import numpy as np
+
+import odds_math
+
+# Compare the old nashpy path in App.trading() against the closed form in odds_math
+# Run from the top folder of the repository: python -m benchmarks.two_way
+
+bet_amount = 100
+markets, sides = 3, 2
+
+
+def random_board(events, seed=0):
+    # Odds in the positive (per $100) form that App.trading() builds from the scraped American odds
+    # Each book prices a fair probability with its own margin, so only some of the pairs are arbitrages
+    rng = np.random.default_rng(seed)
+    fair = rng.uniform(0.2, 0.8, size=(events, markets, 1))
+    fair = np.concatenate([fair, 1 - fair], axis=-1)
+
+    def book():
+        price = 1 / (fair * (1 + rng.uniform(-0.03, 0.06, size=fair.shape)))
+        return (price - 1) * 100
+
+    return book(), book()
+
+
+def nash_board(ask, bid):
+    # The per event loop from App.trading(), before odds_math
+    results = []
+    for k in range(len(ask)):
+        for q in range(markets):
+            for i in range(sides):
+                A = np.array([[ask[k][q][i], -100],
+                              [-100, bid[k][q][1 - i]]])
+
+                result = list(nash.Game(A).support_enumeration())[0][0]
+                result = [round(x, 2) for x in bet_amount * result]
+
+                make_bet, sum_val, total = True, 0, sum(result)
+                for m in range(len(result)):
+                    if (result[m] * A[m][m] / 100 + result[m]) <= total:
+                        make_bet = False
+                    sum_val += sum(result[m] * A[m])
+
+                results.append((result, sum_val / len(result) / 100, make_bet))
+    return results
+
+
+def closed_form_board(ask, bid):
+    return odds_math.two_way(*odds_math.cross_sides(odds_math.to_decimal(ask), odds_math.to_decimal(bid)), bet_amount)
+
+
+for events in [10, 100, 1000]:
+    ask, bid = random_board(events)
+
+    tic = time.perf_counter()
+    old = nash_board(ask, bid)
+    nash_time = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    stakes, returns, arbs = closed_form_board(ask, bid)
+    closed_time = time.perf_counter() - tic
+
+    # Both paths must agree on every stake, return and arbitrage flag
+    old_stakes = np.array([r[0] for r in old]).reshape(stakes.shape)
+    old_returns = np.array([r[1] for r in old]).reshape(returns.shape)
+    old_arbs = np.array([r[2] for r in old]).reshape(arbs.shape)
+    assert np.allclose(old_stakes, stakes, atol=0.011)
+    assert np.allclose(old_returns, returns, atol=0.02)
+    assert (old_arbs == arbs).all()
+
+    print('{:>5} events: nashpy {:9.2f} ms, odds_math {:7.3f} ms, {:8.0f}x faster, {} arbitrages'.format(
+        events, nash_time * 1000, closed_time * 1000, nash_time / closed_time, int(arbs.sum())))
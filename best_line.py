@@ -0,0 +1,157 @@
+import numpy as np
+
+import line_ladder
+import odds_math
+import odds_store
+
+
+def line_keys(markets, sides, lines):
+    # The line of each wager as part of the key of its row: its threshold (line_ladder.py), so both sides of the
+    # same line share a row (team1 -1.5 and team2 +1.5 are 1.5, team1 +1.5 and team2 -1.5 are -1.5, O 9 and U 9
+    # are 9), and '' for moneylines
+    return ['' if line != line else line for line in line_ladder.thresholds(markets, sides, lines).tolist()]
+
+
+class BestLineTable(object):
+    """Decimal prices of every book for every event, market and line, in one array shaped (rows, books, sides)
+
+    Checking for arbitrages takes the best price per side across the books of each row, so adding a book adds a
+    column instead of another pairwise comparison"""
+
+    def __init__(self, books, sides=2, rows=256):
+        self.books, self.sides = list(books), sides
+        self.prices = np.full((rows, len(self.books), sides), np.nan)
+
+        self.rows, self.keys = dict(), dict()  # (event, market, line) -> row, and back
+        self.free = list(range(rows - 1, -1, -1))
+        self.book_rows = [dict() for book in self.books]  # event -> rows with a price from that book
+
+    def row(self, key):
+        if key in self.rows:
+            return self.rows[key]
+
+        if not self.free:
+            # Double the table when it is full
+            size = len(self.prices)
+            self.prices = np.concatenate([self.prices, np.full_like(self.prices, np.nan)])
+            self.free = list(range(2 * size - 1, size - 1, -1))
+
+        self.rows[key] = self.free.pop()
+        self.keys[self.rows[key]] = key
+        return self.rows[key]
+
+    def clear(self, book, event, keep=()):
+        # Drop the prices of a book for an event, except the rows in keep
+        # Rows that no book has a price for any more are freed
+        for row in self.book_rows[book].pop(event, set()) - set(keep):
+            self.prices[row, book] = np.nan
+            if np.isnan(self.prices[row]).all():
+                del self.rows[self.keys.pop(row)]
+                self.free.append(row)
+
+    def update_event(self, book, event, wagering):
+        # Store an event in the l1 / l2 shape from one book
+        self.update_board(book, {event: wagering}, [event])
+
+    def update_prices(self, book, event, prices):
+        # Store an event from one book as (market, side, line, decimal price) cells, such as shared_odds.py reads them
+        # Disabled wagers (NaN) are left out, so every row a book lists holds a price from it, and a row is only
+        # freed once no book lists it any more
+        rows = set()
+        for market, side, line, price in prices:
+            if np.isnan(price):
+                continue
+            row = self.row((event, market, line))
+            rows.add(row)
+            self.prices[row, book, side] = price
+
+        self.clear(book, event, rows)
+        self.book_rows[book][event] = rows
+
+    def update_board(self, book, board, keys=None):
+        # Store a whole board from one book, or only the events in keys
+        # Events that are no longer on the board are dropped
+        # Spreads and totals are stored per line, so check() only compares prices for the same line and
+        # cross_lines() compares different lines
+        if keys is None:
+            keys = board.keys() | self.book_rows[book].keys()
+
+        events = [event for event in keys if event in board]
+        cells = [odds_store.cells(board[event]) for event in events]
+        # Every wager of the board is parsed in one call
+        line, american, decimal, implied = odds_math.parse_wagers(
+            wager for wagers in cells for market, side, wager in wagers)
+        index = np.array([(market, side) for wagers in cells for market, side, wager in wagers]).reshape(-1, 2)
+        lines, prices = line_keys(index[:, 0], index[:, 1], line), decimal.tolist()
+
+        n = 0
+        for event, wagers in zip(events, cells):
+            self.update_prices(book, event, [(market, side, lines[n + m], prices[n + m])
+                                             for m, (market, side, wager) in enumerate(wagers)])
+            n += len(wagers)
+
+        for event in keys:
+            if event not in board:
+                self.clear(book, event)
+
+    def check(self, bet_amount, books=None, decimals=2):
+        # Find the best price for every side of every row across books (all of them by default) in one call
+        # Returns (event, market, line) -> (book per side, decimal price per side, stakes, margin) for each arbitrage
+        if not self.rows:
+            return dict()
+
+        keys = list(self.rows)
+        prices = self.prices[[self.rows[key] for key in keys]]
+        if books is not None:
+            prices = prices[:, books]
+
+        best_book, best_price, stakes, margin, is_arb = odds_math.n_way(prices, bet_amount, decimals=decimals)
+
+        columns = books if books is not None else range(len(self.books))
+        columns = np.asarray(list(columns))
+        return {keys[n]: (columns[best_book[n]].tolist(), best_price[n].tolist(), stakes[n].tolist(), float(margin[n]))
+                for n in np.flatnonzero(is_arb)}
+
+    def cross_lines(self, bet_amount, books=None, decimals=2):
+        # Find arbitrages between different lines of the same spread or total, which check() does not compare:
+        # the best side 0 price of each line against the best side 1 price of the lines above it (line_ladder.py)
+        # Returns (event, market, (line, line)) -> (book per side, decimal price per side, stakes, margin, middle)
+        # for each arbitrage, where margin is the return whatever the score, and middle the return when the score
+        # lands between the two lines
+        keys = [key for key in self.rows if key[2] != '']
+        if not keys:
+            return dict()
+
+        columns = np.asarray(list(books if books is not None else range(len(self.books))))
+        offered = self.prices[[self.rows[key] for key in keys]][:, columns]
+        offered = np.where(np.isnan(offered), -np.inf, offered)
+        best_book = offered.argmax(axis=1)
+        best_price = np.take_along_axis(offered, best_book[:, None, :], axis=1)[:, 0, :]
+        best_book = columns[best_book]
+
+        # A ladder for each event and market, and one lookup in it for each line
+        markets = dict()
+        for n, (event, market, line) in enumerate(keys):
+            markets.setdefault((event, market), []).append(n)
+        pairs = []  # (key, row of side 0, row of side 1)
+        for (event, market), rows in markets.items():
+            if len(rows) < 2:
+                continue
+            ladder = line_ladder.Ladder([(keys[n][2], best_price[n, 1], n) for n in rows if best_price[n, 1] > 1])
+            for n in rows:
+                above = ladder.above(keys[n][2]) if best_price[n, 0] > 1 else None
+                if above is not None:
+                    pairs.append(((event, market, (keys[n][2], above[0])), n, above[2]))
+        if not pairs:
+            return dict()
+
+        # Every pair is priced in one call
+        first, second = [pair[1] for pair in pairs], [pair[2] for pair in pairs]
+        prices = np.stack([best_price[first, 0], best_price[second, 1]], axis=1)
+        legs = np.stack([best_book[first, 0], best_book[second, 1]], axis=1)
+        best, price, stakes, margin, is_arb = odds_math.n_way(prices, bet_amount, decimals=decimals)
+        middle = line_ladder.middle([pair[0][2][0] for pair in pairs], [pair[0][2][1] for pair in pairs], prices,
+                                    stakes)
+        return {pairs[n][0]: (legs[n].tolist(), prices[n].tolist(), stakes[n].tolist(), float(margin[n]),
+                              float(middle[n]))
+                for n in np.flatnonzero(is_arb)}
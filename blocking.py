@@ -0,0 +1,39 @@
+# Resource-light browsers: the programs only read text and click a few elements, so images, fonts, video and
+# analytics do not need to load. Images are switched off with a Chrome pref, and everything on the blocklist is
+# blocked by URL through the DevTools Protocol (Network.setBlockedURLs), which also covers fonts, media and trackers
+# A blocklist holds categories from PATTERNS, or URL patterns of your own with * wildcards, i.e. ['images', '*promo*']
+
+PATTERNS = {
+    'images': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico'],
+    'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.ogg', '*.m4a'],
+    'trackers': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*connect.facebook.net*',
+                 '*hotjar.com*', '*segment.io*', '*newrelic.com*', '*nr-data.net*', '*optimizely.com*',
+                 '*quantummetric.com*', '*fullstory.com*', '*mixpanel.com*', '*amplitude.com*', '*branch.io*',
+                 '*bat.bing.com*', '*adsrvr.org*'],
+}
+DEFAULT = ['images', 'fonts', 'media', 'trackers']
+
+
+def patterns(blocked):
+    urls = []
+    for entry in blocked:
+        urls += PATTERNS.get(entry, [entry])
+    return urls
+
+
+def prefs(options, blocked):
+    # Add to the ChromeOptions before the browser starts
+    if 'images' in blocked:
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    if 'media' in blocked:
+        options.add_argument('--autoplay-policy=user-gesture-required')
+    return options
+
+
+def block(driver, blocked):
+    # Call once the browser has started, before the page is loaded
+    urls = patterns(blocked)
+    if urls:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
@@ -0,0 +1,123 @@
+# JavaScript extractors injected with driver.execute_script()
+# Each one walks a sportsbook's live page and returns the whole board in one WebDriver round trip,
+# instead of a find_element / .text / get_attribute call for every team, wager and field
+# Every event comes back in the l1 / l2 shape used by App.trading(), with the full team names last:
+#   over / under, moneyline and spread sports:  [[spread1, spread2], [moneyline1, moneyline2], [total1, total2], team1, team2]
+#   two person sports:                           [moneyline1, moneyline2, team1, team2]
+# Disabled wagers come back as ''
+
+HELPERS = """
+function all(xpath, node) {
+    var found = document.evaluate(xpath, node || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var n = 0; n < found.snapshotLength; n++) {
+        nodes.push(found.snapshotItem(n));
+    }
+    return nodes;
+}
+
+function one(xpath, node) {
+    return all(xpath, node)[0] || null;
+}
+
+function text(el) {
+    // Same clean up as .text.replace('\\n', ' ').replace('  ', ' ') in Python
+    return el ? el.innerText.trim().split('\\n').join(' ').split('  ').join(' ') : '';
+}
+
+function wager(el) {
+    return !el || el.innerHTML.indexOf('disabled') >= 0 ? '' : text(el);
+}
+"""
+
+DRAFTKINGS = HELPERS + """
+var rows = all("(//tbody[@class='sportsbook-table__body'])[1]//tr");
+var board = [];
+for (var i = 0; i + 1 < rows.length; i += 2) {
+    var cells1 = all(".//td[contains(@class,'sportsbook-table__column-row')]", rows[i]);
+    var cells2 = all(".//td[contains(@class,'sportsbook-table__column-row')]", rows[i + 1]);
+    if (cells1.length < 3 || cells2.length < 3) {
+        continue;
+    }
+    board.push([
+        [wager(cells1[0]), wager(cells2[0])],
+        [wager(cells1[2]), wager(cells2[2])],
+        [wager(cells1[1]), wager(cells2[1])],
+        text(one(".//div[@class='event-cell__name-text']", rows[i])),
+        text(one(".//div[@class='event-cell__name-text']", rows[i + 1]))
+    ]);
+}
+return board;
+"""
+
+DRAFTKINGS_TWO_PERSON = HELPERS + """
+var results = all("//div[contains(@class,'sportsbook-event-accordion__wrapper')]//div[contains(@class,'sportsbook-outcome-cell__body') and not(contains(@class,'disabled'))]/../../../../..");
+var board = [];
+for (var i = 0; i < results.length; i++) {
+    var names = all(".//div[@class='live-score-body__row--team']", results[i]);
+    var cells = all(".//div[@class='sportsbook-outcome-cell__elements']", results[i]);
+    if (names.length < 2 || cells.length < 2) {
+        continue;
+    }
+    board.push([text(cells[0]), text(cells[1]), text(names[0]), text(names[1])]);
+}
+return board;
+"""
+
+FANDUEL = HELPERS + """
+var results = all("//a[@target='_self' and contains(@title,'@') and not(contains(.,'live event'))]/..");
+var board = [];
+for (var i = 0; i < results.length; i++) {
+    var names = all(".//div[contains(@style,'background-image')]/../div[2]/span", results[i]);
+    var teams = all("./div/div", results[i]);
+    if (names.length < 2 || teams.length < 2) {
+        continue;
+    }
+    var cells1 = all("./div", teams[0]);
+    var cells2 = all("./div", teams[1]);
+    if (cells1.length < 3 || cells2.length < 3) {
+        continue;
+    }
+    board.push([
+        [text(cells1[0]), text(cells2[0])],
+        [text(cells1[1]), text(cells2[1])],
+        [text(cells1[2]), text(cells2[2])],
+        text(names[0]),
+        text(names[1])
+    ]);
+}
+return board;
+"""
+
+FANDUEL_TWO_PERSON = HELPERS + """
+var results = all("//a[@target='_self' and contains(@title,' ') and contains(.,'live event')]/..//a[@target='_self' and contains(@title,' ') and not(contains(.,'live event'))]/..");
+var board = [];
+for (var i = 0; i < results.length; i++) {
+    var names = all("./a/div/div[2]/div[1]", results[i]);
+    var cells = all("./div/div", results[i]);
+    if (names.length < 2 || cells.length < 2) {
+        continue;
+    }
+    board.push([text(cells[0]), text(cells[1]), text(one(".//span", names[0])), text(one(".//span", names[1]))]);
+}
+return board;
+"""
+
+WILLIAM_HILL_TWO_PERSON = HELPERS + """
+var results = all("//div[contains(@class,'groupedMarketTemplateGrid')]");
+var board = [];
+for (var i = 0; i < results.length; i++) {
+    var names = all(".//div[@class='teamNameContainer']", results[i]);
+    var cells = all(".//div[contains(@class,'selectionContainer')]", results[i]);
+    if (names.length < 2 || cells.length < 2) {
+        continue;
+    }
+    board.push([text(cells[0]), text(cells[1]), text(names[0]), text(names[1])]);
+}
+return board;
+"""
+
+
+def read_board(driver, script):
+    # Run the extractor and return the list of events, or an empty board if the page has nothing live
+    return driver.execute_script(script) or []
@@ -0,0 +1,273 @@
+import time
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+import board_scripts
+import elements
+
+# Everything that differs between the sportsbooks: the live page, how to open a sport, how to read the board
+# (from the page, or from the JSON payloads it downloads), and how to select, stake, submit and clear a wager
+# event is a matched event in the l1 / l2 shape, with the team names shown on that website last
+# market is the index of the market in the event (spread, moneyline, total), side is 0 for team1 and 1 for team2
+
+
+def betslip_odds(driver, xpath, timeout=elements.WAITS['betslip']):
+    # Wait for the odds of the selected wager to show up on the betslip
+    # The odds element is kept, and looked up again while it is missing or once the betslip has replaced it
+    # Waits elements.POLL between reads, whether the element is missing or still empty
+    cache, deadline = elements.cache(driver), time.perf_counter() + timeout
+    odds = ''
+    while time.perf_counter() < deadline:
+        try:
+            odds = cache.use(xpath, lambda element: element.text.strip())
+        except NoSuchElementException:
+            pass
+        if odds != '':
+            break
+        time.sleep(elements.POLL)
+    return odds
+
+
+def scroll_to_top(driver):
+    elements.cache(driver).use('body', lambda body: body.send_keys(Keys.CONTROL + Keys.HOME), by=By.TAG_NAME)
+
+
+def stake_input(driver, xpath, bet_amount):
+    elements.cache(driver).use(xpath, lambda stake: stake.send_keys(bet_amount), elements.WAITS['stake'])
+
+
+def place_button(driver, xpath):
+    # The Place Bet button, or None if it does not show up in time
+    try:
+        return elements.find(driver, xpath, elements.WAITS['button'])
+    except NoSuchElementException:
+        return None
+
+
+def teams(name):
+    # 'Away @ Home', 'Player A vs Player B' or 'Player A v Player B' -> (team1, team2), in the order the page shows them
+    for separator in [' @ ', ' vs ', ' v ']:
+        if separator in name:
+            return tuple(name.split(separator, 1))
+    return None
+
+
+def market_index(name):
+    # Market name from a payload -> index of the market in the l1 shape (spread, moneyline, total)
+    name = name.lower()
+    if 'total' in name:
+        return 2
+    if 'spread' in name or 'run line' in name or 'handicap' in name:
+        return 0
+    if 'moneyline' in name or 'money line' in name or 'match betting' in name or 'winner' in name:
+        return 1
+    return None
+
+
+def wager_text(market, side, line, american):
+    # A price from a payload written the way the website shows it ('+1.5 -120', 'O 8.5 -110', '+150')
+    odds = '{:+d}'.format(int(american))
+    if market == 0:
+        return '{:+g} {}'.format(float(line), odds)
+    if market == 2:
+        return '{} {:g} {}'.format('OU'[side], float(line), odds)
+    return odds
+
+
+def network_cells(event_name, market_name, outcomes, two_person):
+    # outcomes are (label, line, american odds) from a payload
+    # Returns cells for network_feed.NetworkFeed: (team1, team2, market, side, wager text)
+    names, market = teams(event_name or ''), market_index(market_name or '')
+    if names is None or market is None or (two_person and market != 1):
+        return []
+
+    cells = []
+    for label, line, american in outcomes:
+        if market == 2:
+            side = 0 if label.lower().startswith('o') else 1
+        elif label in names:
+            side = names.index(label)
+        else:
+            continue
+        try:
+            wager = wager_text(market, side, line, american)
+        except (TypeError, ValueError):
+            # Suspended wagers come without odds, the same as a disabled cell
+            wager = ''
+        cells.append((names[0], names[1], 0 if two_person else market, side, wager))
+    return cells
+
+
+class DraftKings(object):
+    name = 'DraftKings'
+    URL = 'https://sportsbook.draftkings.com/live'
+
+    def open_sport(self, driver, sport):
+        elements.find(driver, "//a[@role='tab']/span[text()='" + sport + "']", elements.WAITS['page']).click()
+
+        # Two person sports are listed in accordions, open the ones that are closed
+        time.sleep(1)
+        for elem in driver.find_elements(By.XPATH,
+                                         "//div[@aria-label='Featured Accordion' and @aria-expanded='false']//*[@role='img']"):
+            elem.click()
+
+    def board_script(self, two_person):
+        return board_scripts.DRAFTKINGS_TWO_PERSON if two_person else board_scripts.DRAFTKINGS
+
+    def parse_payload(self, payload, two_person):
+        # Event group payloads: events with their names, and offers holding the outcomes of one market of one event
+        if not isinstance(payload, dict):
+            return []
+        group = payload.get('eventGroup', payload)
+        names = {event.get('eventId'): event.get('name') for event in group.get('events', [])}
+
+        cells = []
+        for category in group.get('offerCategories', []):
+            for descriptor in category.get('offerSubcategoryDescriptors', []):
+                for offers in descriptor.get('offerSubcategory', dict()).get('offers', []):
+                    for offer in offers:
+                        cells += network_cells(names.get(offer.get('eventId')), offer.get('label'),
+                                               [(outcome.get('label', ''), outcome.get('line'),
+                                                 outcome.get('oddsAmerican')) for outcome in offer.get('outcomes', [])],
+                                               two_person)
+        return cells
+
+    def select(self, driver, event, market, side):
+        if isinstance(event[0], list):
+            # The website shows the spread, total and moneyline columns in a different order
+            row = "(//tbody[@class='sportsbook-table__body'])[1]//tr[contains(.,'" + event[-2 + side] + "')]"
+            cells, names, column = ".//td[contains(@class,'sportsbook-table__column-row')]", [event[-2 + side]], \
+                [0, 2, 1][market]
+        else:
+            row = "//div[contains(@class,'sportsbook-event-accordion__wrapper') and contains(.,'" + \
+                  event[-2] + "') and contains(.,'" + event[-1] + "')]"
+            cells, names, column = ".//div[@class='sportsbook-outcome-cell__elements']/../..", event[-2:], side
+
+        def click(row):
+            wager = elements.still_shows(row, *names).find_elements(By.XPATH, cells)[column]
+            driver.execute_script("arguments[0].scrollIntoView();", wager)
+            wager.click()
+
+        # The event row is kept, so selecting from the same event again skips the search of the whole page
+        elements.cache(driver).use(row, click, elements.WAITS['wager'])
+        scroll_to_top(driver)
+
+        return betslip_odds(driver, "//div[contains(@class,'betslip-odds__display-standard')]/span")
+
+    def clear(self, driver):
+        close = "//div[contains(@class,'betslip-outcome-card')]/*[@aria-label='Close' and @role='img']"
+        for elem in elements.find_all(driver, close, elements.WAITS['remove']):
+            elem.click()
+
+    def stake(self, driver, bet_amount):
+        stake_input(driver, "//input[@name='stake']", bet_amount)
+        return place_button(driver, "//div[contains(@class,'place-bet-button__wrapper') and contains(.,'Place Bet')]")
+
+    def submit(self, driver, button):
+        driver.execute_script("arguments[0].click();", button)
+
+
+class FanDuel(object):
+    name = 'FanDuel'
+    URL = 'https://sportsbook.fanduel.com/live'
+
+    def open_sport(self, driver, sport):
+        elements.find(driver, "//a[contains(@href,'/live')]//span[text()='" + sport + "']", elements.WAITS['page']).click()
+
+    def board_script(self, two_person):
+        return board_scripts.FANDUEL_TWO_PERSON if two_person else board_scripts.FANDUEL
+
+    def parse_payload(self, payload, two_person):
+        # Page payloads: attachments with events by id, and markets by id holding runners with their odds
+        if not isinstance(payload, dict):
+            return []
+        attachments = payload.get('attachments', payload)
+        events = attachments.get('events', dict())
+
+        cells = []
+        for market in attachments.get('markets', dict()).values():
+            event = events.get(str(market.get('eventId')), dict())
+            cells += network_cells(event.get('name'), market.get('marketName'),
+                                   [(runner.get('runnerName', ''), runner.get('handicap'),
+                                     runner.get('winRunnerOdds', dict()).get('americanDisplayOdds', dict())
+                                     .get('americanOdds')) for runner in market.get('runners', [])],
+                                   two_person)
+        return cells
+
+    def select(self, driver, event, market, side):
+        row = "//a[@target='_self' and contains(@title,' ') and contains(.,'live event')]/..//a[@target='_self' and contains(@title,' ') and not(contains(.,'live event')) and contains(.,'" + \
+              event[-2] + "') and contains(.,'" + event[-1] + "')]/.."
+
+        def click(row):
+            wager = elements.still_shows(row, event[-2], event[-1]).find_elements(By.XPATH, "./div/div")[side]
+            if isinstance(event[0], list):
+                wager = wager.find_elements(By.TAG_NAME, 'div')[market]
+
+            driver.execute_script(
+                "const mouseoverEvent = new Event('mouseover');arguments[0].dispatchEvent(mouseoverEvent)", wager)
+            driver.execute_script("arguments[0].click();", wager)
+
+        elements.cache(driver).use(row, click, elements.WAITS['wager'])
+        scroll_to_top(driver)
+
+        return betslip_odds(driver, "//li//div[contains(@style,'transform')]")
+
+    def clear(self, driver):
+        for elem in elements.find_all(driver, "//*[contains(@id,'remove-circle')]/..", elements.WAITS['remove']):
+            elem.click()
+
+    def stake(self, driver, bet_amount):
+        stake_input(driver, "//span[text()='WAGER']/..//input", bet_amount)
+        return place_button(driver, "//span[contains(text(),'Place')]/../../../..")
+
+    def submit(self, driver, button):
+        driver.execute_script("arguments[0].click();", button)
+
+
+class WilliamHill(object):
+    name = 'William Hill'
+    URL = 'https://www.williamhill.com/us/il/bet/inplay/all'
+
+    def open_sport(self, driver, sport):
+        elements.find(driver, "//span[@class='pill-title' and text()='" + sport + "']", elements.WAITS['page']).click()
+
+    def board_script(self, two_person):
+        # Only the two person board has been mapped for William Hill
+        return board_scripts.WILLIAM_HILL_TWO_PERSON if two_person else None
+
+    def parse_payload(self, payload, two_person):
+        # The William Hill payloads have not been mapped yet
+        return []
+
+    def select(self, driver, event, market, side):
+        row = "//div[contains(@class,'groupedMarketTemplateGrid') and contains(.,'" + \
+              event[-2] + "') and contains(.,'" + event[-1] + "')]"
+
+        def click(row):
+            wager = elements.still_shows(row, event[-2], event[-1]).find_elements(
+                By.XPATH, ".//div[contains(@class,'selectionContainer')]/button")[side]
+            driver.execute_script("arguments[0].click();", wager)
+
+        elements.cache(driver).use(row, click, elements.WAITS['wager'])
+
+        return betslip_odds(driver, "//span[contains(@class,'betslipSectionOdds')]/span")
+
+    def clear(self, driver):
+        for elem in elements.find_all(driver, "//button[@data-qa='remove-bet-button']", elements.WAITS['remove']):
+            driver.execute_script("arguments[0].click();", elem)
+
+    def stake(self, driver, bet_amount):
+        stake_input(driver, "//input[@data-qa='betslip-input-field-desktop']", bet_amount)
+        elements.cache(driver).use('body', lambda body: body.click(), by=By.TAG_NAME)
+        return place_button(driver, "//button[@data-qa='place-bet-button' and not(contains(@class,'disabled'))]")
+
+    def submit(self, driver, button):
+        # One click only, a second click could place the same wager again
+        # The wager is taken once the Place Bet button has gone, which has to happen before the submit deadline
+        driver.execute_script("arguments[0].click();", button)
+        if not elements.gone(driver, "//button[@data-qa='place-bet-button' and not(contains(@class,'disabled'))]",
+                             elements.WAITS['confirm']):
+            raise ValueError('The wager was not confirmed')
+
+BOOKS = {book.name: book for book in [DraftKings(), FanDuel(), WilliamHill()]}
@@ -0,0 +1,51 @@
+import concurrent.futures
+import os
+import re
+import threading
+import time
+
+import board_scripts
+
+# Starting the browsers: all sportsbooks at once, each with its own Chrome profile that is kept between runs,
+# so logins, cookies and the cached pages carry over and a restart does not start from a cold browser
+# A sportsbook is ready once its board can be read, which is what the first scan needs
+
+# undetected_chromedriver patches the chromedriver binary when a browser is created, two at once can trip over
+# each other. Only the creation takes turns, loading the pages and opening the sport still run side by side
+launching = threading.Lock()
+
+
+def profile(root, name):
+    # Chrome profile folder of a sportsbook, i.e. profiles/william_hill. None if root is empty
+    if not root:
+        return None
+    path = os.path.abspath(os.path.join(root, re.sub(r'\W+', '_', name.lower())))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def parallel(*functions):
+    # Run every function at once, returns their results in the same order
+    with concurrent.futures.ThreadPoolExecutor(len(functions)) as executor:
+        return [future.result() for future in [executor.submit(function) for function in functions]]
+
+
+def ready(driver, script, timeout=30):
+    # Seconds until the board shows at least one event, or None if it does not within timeout
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            if board_scripts.read_board(driver, script):
+                return time.perf_counter() - start
+        except Exception:
+            pass
+        time.sleep(0.25)
+    return None
+
+
+def report(name, started, waited):
+    # started is the time.perf_counter() when the browser was launched, waited is what ready() returned
+    if waited is None:
+        print('{} is not ready, no events {:.1f}s after starting'.format(name, time.perf_counter() - started))
+    else:
+        print('{} is ready to scan, {:.1f}s after starting'.format(name, time.perf_counter() - started))
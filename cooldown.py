@@ -0,0 +1,56 @@
+import heapq
+import time
+
+# Cooldowns for single opportunities, instead of sleeping the whole program after a wager
+# An event and market that was just wagered on (or whose odds moved on the betslip) is skipped until its cooldown
+# runs out, while every other event is still scanned and checked at full rate
+
+
+class Cooldowns(object):
+    """Keys (such as (event, market)) that are cooling down, each until its own time
+
+    Expired keys are dropped as they are found. If more than maxsize keys are cooling down,
+    the ones closest to running out are dropped first
+    With track=True the keys that run out are kept for expired(), which then has to be called every scan"""
+
+    def __init__(self, maxsize=1000, clock=time.monotonic, track=False):
+        self.maxsize, self.clock, self.track = maxsize, clock, track
+        self.until = dict()  # key -> time the cooldown runs out
+        self.heap = []  # (time, key), with old entries left in until they reach the top
+        self.ended = []  # Keys that ran out since expired() was last called, with track=True
+
+    def add(self, key, seconds):
+        # Start or extend the cooldown of a key
+        until = max(self.clock() + seconds, self.until.get(key, 0))
+        self.until[key] = until
+        heapq.heappush(self.heap, (until, key))
+        self.evict()
+
+    def __contains__(self, key):
+        until = self.until.get(key)
+        if until is None:
+            return False
+        if until > self.clock():
+            return True
+        self.evict()
+        return False
+
+    def evict(self):
+        now = self.clock()
+        while self.heap and (self.heap[0][0] <= now or len(self.until) > self.maxsize):
+            until, key = heapq.heappop(self.heap)
+            # Skip the entries of cooldowns that were extended since
+            if self.until.get(key) == until:
+                del self.until[key]
+                if self.track:
+                    self.ended.append(key)
+
+    def expired(self):
+        # Keys whose cooldown ran out since the last call, so they can be checked again even if their odds did not move
+        self.evict()
+        ended, self.ended = self.ended, []
+        return ended
+
+    def __len__(self):
+        self.evict()
+        return len(self.until)
@@ -0,0 +1,109 @@
+import weakref
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Element lookups that fail fast. The browsers run with implicitly_wait(0), so a missing element (a disabled cell,
+# an event that has finished, a betslip that changed) costs one round trip instead of the 5 second implicit wait.
+# Each call site waits only as long as it says in WAITS
+# Stable elements (the page body, event rows, the betslip odds and the stake input) are kept per browser and only
+# looked up again once the page has replaced them (StaleElementReferenceException)
+
+WAITS = {
+    'page': 10,  # Sport tabs, once when the program starts and the page may still be loading
+    'wager': 1,  # The row of an event, when selecting a wager
+    'betslip': 2,  # The odds on the betslip, after a wager is selected
+    'stake': 1,  # The stake input on the betslip
+    'button': 0.5,  # The Place Bet button, after the stake is entered
+    'confirm': 4,  # The Place Bet button to go away once it is clicked, within placement.DEADLINES['submit']
+    'remove': 0,  # The remove buttons on the betslip, it is fine if there are none
+}
+POLL = 0.02  # Seconds between lookups while waiting
+
+
+def find(driver, xpath, timeout=0, by=By.XPATH):
+    # First element matching xpath, waiting up to timeout seconds for it. Raises NoSuchElementException
+    if timeout <= 0:
+        return driver.find_element(by, xpath)
+    try:
+        return WebDriverWait(driver, timeout, POLL).until(expected_conditions.presence_of_element_located((by, xpath)))
+    except TimeoutException:
+        raise NoSuchElementException('Nothing found in {}s: {}'.format(timeout, xpath))
+
+
+def find_all(driver, xpath, timeout=0, by=By.XPATH):
+    # Elements matching xpath, waiting up to timeout seconds for at least one. Returns [] if there are none
+    elements = driver.find_elements(by, xpath)
+    if elements or timeout <= 0:
+        return elements
+    try:
+        return WebDriverWait(driver, timeout, POLL).until(lambda driver: driver.find_elements(by, xpath))
+    except TimeoutException:
+        return []
+
+
+def gone(driver, xpath, timeout=0, by=By.XPATH):
+    # True once nothing matches xpath, waiting up to timeout seconds for it. False if it is still there
+    try:
+        return WebDriverWait(driver, timeout, POLL).until(lambda driver: not driver.find_elements(by, xpath))
+    except TimeoutException:
+        return False
+
+
+class ElementCache(object):
+    """WebElement handles of one browser by their XPath, looked up again only once they have gone stale"""
+
+    def __init__(self, driver, maxsize=256):
+        self.driver, self.maxsize = driver, maxsize
+        self.elements = dict()  # (by, xpath) -> WebElement, oldest first
+        self.hits, self.misses = 0, 0
+
+    def get(self, xpath, timeout=0, by=By.XPATH, fresh=False):
+        key = (by, xpath)
+        if not fresh and key in self.elements:
+            self.hits += 1
+            return self.elements[key]
+
+        self.misses += 1
+        element = find(self.driver, xpath, timeout, by)
+        self.elements.pop(key, None)
+        self.elements[key] = element
+        # Event rows come and go, drop the oldest ones
+        while len(self.elements) > self.maxsize:
+            del self.elements[next(iter(self.elements))]
+        return element
+
+    def use(self, xpath, action, timeout=0, by=By.XPATH):
+        # Returns action(element), with the element looked up again once if the page has replaced it
+        try:
+            return action(self.get(xpath, timeout, by))
+        except StaleElementReferenceException:
+            self.forget(xpath, by)
+            return action(self.get(xpath, timeout, by, fresh=True))
+
+    def forget(self, xpath, by=By.XPATH):
+        self.elements.pop((by, xpath), None)
+
+
+caches = weakref.WeakKeyDictionary()  # driver -> {window handle: ElementCache}
+shown = weakref.WeakKeyDictionary()  # driver -> window handle of the tab it shows, if it has more than one (tabs.py)
+
+
+def cache(driver):
+    # The element cache of the tab a browser shows, made the first time it is used
+    # Elements belong to the page of their tab, so each tab has its own
+    tabs = caches.setdefault(driver, dict())
+    tab = shown.get(driver)
+    if tab not in tabs:
+        tabs[tab] = ElementCache(driver)
+    return tabs[tab]
+
+
+def still_shows(element, *texts):
+    # Pages reuse rows for other events, so a cached row has to still show the event it was found for
+    # textContent is the text XPath's contains(.,) looks at, whatever the CSS does to it
+    text = element.get_attribute('textContent') or ''
+    if not all(part in text for part in texts):
+        raise StaleElementReferenceException('The element shows something else now')
+    return element
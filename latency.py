@@ -0,0 +1,104 @@
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency of every stage of a scan (scrape, name match, parse, odds conversion, solve, select, stake, submit),
+# kept in histograms and exported in the Prometheus text format, to a file or on a local HTTP endpoint
+# Recording is a perf_counter() difference, one log and one dict increment, so it can stay on while trading
+
+
+class Histogram(object):
+    """HDR-style histogram: buckets grow by a fixed ratio, so every value is kept within 1% at any scale"""
+
+    def __init__(self, precision=0.01):
+        self.scale = 1 / math.log1p(precision)
+        self.counts = dict()  # bucket -> count
+        self.count, self.sum, self.max = 0, 0.0, 0.0
+
+    def record(self, seconds):
+        # Bucket n holds the values from exp(n / scale) up to exp((n + 1) / scale), also below one second
+        bucket = math.floor(math.log(max(seconds, 1e-9)) * self.scale)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count, self.sum, self.max = self.count + 1, self.sum + seconds, max(self.max, seconds)
+
+    def percentile(self, percent):
+        if not self.count:
+            return 0.0
+        rank, seen = percent / 100 * self.count, 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                # The upper edge of the bucket, but never more than the largest value seen
+                return min(math.exp((bucket + 1) / self.scale), self.max)
+        return self.max
+
+
+class Metrics(object):
+    """One histogram per stage and website"""
+
+    def __init__(self, path='', port=0, interval=10):
+        self.path, self.interval, self.written = path, interval, 0
+        self.histograms = dict()  # (stage, book) -> Histogram
+        self.lock = threading.Lock()
+        if port:
+            self.serve(port)
+
+    def record(self, stage, seconds, book=''):
+        with self.lock:
+            if (stage, book) not in self.histograms:
+                self.histograms[(stage, book)] = Histogram()
+            self.histograms[(stage, book)].record(seconds)
+
+    def summary(self):
+        # (stage, book) -> (count, p50, p99, max) in seconds
+        with self.lock:
+            return {key: (histogram.count, histogram.percentile(50), histogram.percentile(99), histogram.max)
+                    for key, histogram in sorted(self.histograms.items())}
+
+    def prometheus(self):
+        lines = ['# HELP arb_stage_seconds Latency of each stage of a scan',
+                 '# TYPE arb_stage_seconds summary']
+        maxima = ['# HELP arb_stage_seconds_max Slowest run of each stage of a scan',
+                  '# TYPE arb_stage_seconds_max gauge']
+        with self.lock:
+            for (stage, book), histogram in sorted(self.histograms.items()):
+                labels = 'stage="{}",book="{}"'.format(stage, book)
+                for quantile in [0.5, 0.9, 0.99]:
+                    lines.append('arb_stage_seconds{{{},quantile="{}"}} {:.9f}'.format(
+                        labels, quantile, histogram.percentile(quantile * 100)))
+                lines.append('arb_stage_seconds_sum{{{}}} {:.9f}'.format(labels, histogram.sum))
+                lines.append('arb_stage_seconds_count{{{}}} {}'.format(labels, histogram.count))
+                maxima.append('arb_stage_seconds_max{{{}}} {:.9f}'.format(labels, histogram.max))
+        return '\n'.join(lines + maxima) + '\n'
+
+    def flush(self):
+        # Write the text file every interval seconds, such as for the node exporter textfile collector
+        if not self.path or time.time() - self.written < self.interval:
+            return
+        self.written = time.time()
+        with open(self.path + '.tmp', 'w') as file:
+            file.write(self.prometheus())
+        # Replace the file in one step, so it is never read half written
+        os.replace(self.path + '.tmp', self.path)
+
+    def serve(self, port):
+        # http://localhost:<port>/metrics, from a background thread
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('localhost', port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
@@ -0,0 +1,63 @@
+import bisect
+
+import numpy as np
+
+# Spreads and totals are not always offered at the same line: one sportsbook has O 8.5 when another has U 9, or
+# -1.5 when another has +2. Every line is turned into its threshold, the score where its wager goes from losing to
+# winning, on the score x that the market is about (the total for totals, team1's score minus team2's for spreads):
+#   side 0 (over, team1) wins when x is above its threshold:   O 8.5 -> 8.5, team1 -1.5 -> 1.5, team1 +2 -> -2
+#   side 1 (under, team2) wins when x is below its threshold:  U 9 -> 9, team2 +1.5 -> 1.5, team2 -2 -> -2
+# Both sides of the same line have the same threshold. A side 0 wager at a and a side 1 wager at b >= a leave no
+# score where both lose, and when b > a both win on a score between them (a middle). A side 0 wager at a and a side
+# 1 wager at b < a both lose on a score between b and a, so they are never paired
+# The side 1 wagers of a market are kept in a ladder sorted by threshold, with the best price at or above each
+# threshold, so the best wager to pair with a side 0 wager is one bisect, O(lines log lines) for a whole board
+# Scores are whole numbers, and a wager that lands exactly on its line is a push that gets its stake back
+
+SPREAD, TOTAL = 0, 2  # Markets with lines, in the order of the l1 / l2 shape
+
+
+def thresholds(markets, sides, lines):
+    # Thresholds of wagers from their market, side and line (spreads with their sign), as arrays or numbers
+    return np.where((np.asarray(markets) == SPREAD) & (np.asarray(sides) == 0), np.negative(lines), lines)
+
+
+def covers(market, line, other):
+    # True if a side 0 wager at line and a side 1 wager at other leave no score where both lose
+    # False if either has no line (NaN)
+    # Plain numbers, since the pairwise programs check each pair of wagers on its own
+    return (-line if market == SPREAD else line) <= other
+
+
+class Ladder(object):
+    """Side 1 wagers of one market across lines, sorted by threshold, with the best price at or above each
+
+    wagers are (threshold, decimal price, item), where item is anything that tells the wager apart, such as a row"""
+
+    def __init__(self, wagers):
+        wagers = sorted(wagers)
+        self.thresholds = [wager[0] for wager in wagers]
+        # best[n] is the wager with the highest price from n up, the higher threshold (the wider middle) on a tie
+        self.best = list(wagers)
+        for n in range(len(wagers) - 2, -1, -1):
+            if self.best[n + 1][1] >= self.best[n][1]:
+                self.best[n] = self.best[n + 1]
+
+    def above(self, threshold):
+        # The best wager with a threshold above this one, or None
+        n = bisect.bisect_right(self.thresholds, threshold)
+        return self.best[n] if n < len(self.best) else None
+
+
+def middle(lower, upper, prices, stakes):
+    # The best return, as a fraction of the total stake, when the score lands between a side 0 wager at lower and
+    # a side 1 wager at upper (both win, or one wins and the other is a push), NaN if no score can
+    # prices and stakes are shaped (pairs, 2), lower and upper are thresholds
+    lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+    total = stakes.sum(axis=1)
+    won = stakes * prices
+    between = np.where(np.floor(lower) + 1 < upper, won.sum(axis=1), np.nan)
+    on_upper = np.where((upper > lower) & (upper == np.floor(upper)), won[:, 0] + stakes[:, 1], np.nan)
+    on_lower = np.where((upper > lower) & (lower == np.floor(lower)), stakes[:, 0] + won[:, 1], np.nan)
+    best = np.fmax(np.fmax(between, on_upper), on_lower)
+    return (best - total) / np.where(total > 0, total, 1)
@@ -0,0 +1,53 @@
+import odds_math
+
+# A typed model of an event, instead of the nested lists of strings the boards are read as:
+# an Event has Markets (spread, moneyline, total), and a Market has an outcome per side, the line and odds of its
+# wager text as odds_math.read_wager() reads it ('+1.5 −120' -> (1.5, -120, 83.33)). Each text is read once and the
+# same outcome is shared by every event and scan that shows it, so building an Event for a changed event is then a
+# few small objects, with no parsing and no copy of the board
+# The boards themselves stay in the l1 / l2 shape, which books.py, odds_store.py and tick_log.py work on
+
+SPREAD, MONEYLINE, TOTAL = 0, 1, 2  # Markets in the order of the l1 / l2 shape
+
+
+class Market(object):
+    """The outcomes of one market of an event, side 0 and side 1"""
+
+    __slots__ = ('kind', 'outcomes')
+
+    def __init__(self, kind, outcomes):
+        self.kind, self.outcomes = kind, outcomes
+
+    def __getitem__(self, side):
+        return self.outcomes[side]
+
+    def __repr__(self):
+        return repr(list(self.outcomes))
+
+
+class Event(object):
+    """An event on one website: its markets in the order of the l1 / l2 shape, and the team or player names
+
+    Made from the l1 / l2 shape, [[spread1, spread2], [ml1, ml2], [total1, total2], team1, team2],
+    or [w1, w2, team1, team2] for two person events, which have only the moneyline (markets[0])"""
+
+    __slots__ = ('team1', 'team2', 'markets')
+
+    def __init__(self, wagering):
+        self.team1, self.team2 = wagering[-2], wagering[-1]
+        wagers = wagering[:-2]
+        if wagers and isinstance(wagers[0], list):
+            self.markets = tuple(Market(kind, (odds_math.read_wager(side1), odds_math.read_wager(side2)))
+                                 for kind, (side1, side2) in enumerate(wagers))
+        else:
+            self.markets = (Market(MONEYLINE, tuple(odds_math.read_wager(wager) for wager in wagers)),)
+
+    def __getitem__(self, market):
+        return self.markets[market]
+
+    def odds(self):
+        # Positive odds of every market and side, [[side1, side2], ...]
+        return [[outcome.odds for outcome in market.outcomes] for market in self.markets]
+
+    def __repr__(self):
+        return repr(list(self.markets) + [self.team1, self.team2])
@@ -0,0 +1,137 @@
+import difflib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+# Canonical team name -> the other names the sportsbooks use for it
+MLB_TEAMS = {
+    'Diamondbacks': ['Arizona Diamondbacks', 'ARI Diamondbacks', 'Arizona', 'ARI', 'D-backs'],
+    'Braves': ['Atlanta Braves', 'ATL Braves', 'Atlanta', 'ATL'],
+    'Orioles': ['Baltimore Orioles', 'BAL Orioles', 'Baltimore', 'BAL'],
+    'Red Sox': ['Boston Red Sox', 'BOS Red Sox', 'Boston', 'BOS'],
+    'Cubs': ['Chicago Cubs', 'CHI Cubs', 'CHC'],
+    'White Sox': ['Chicago White Sox', 'CHI White Sox', 'CWS', 'CHW'],
+    'Reds': ['Cincinnati Reds', 'CIN Reds', 'Cincinnati', 'CIN'],
+    'Guardians': ['Cleveland Guardians', 'CLE Guardians', 'Cleveland', 'CLE'],
+    'Rockies': ['Colorado Rockies', 'COL Rockies', 'Colorado', 'COL'],
+    'Tigers': ['Detroit Tigers', 'DET Tigers', 'Detroit', 'DET'],
+    'Astros': ['Houston Astros', 'HOU Astros', 'Houston', 'HOU'],
+    'Royals': ['Kansas City Royals', 'KC Royals', 'Kansas City', 'KC', 'KCR'],
+    'Angels': ['Los Angeles Angels', 'LA Angels', 'LAA Angels', 'LAA'],
+    'Dodgers': ['Los Angeles Dodgers', 'LA Dodgers', 'LAD Dodgers', 'LAD'],
+    'Marlins': ['Miami Marlins', 'MIA Marlins', 'Miami', 'MIA'],
+    'Brewers': ['Milwaukee Brewers', 'MIL Brewers', 'Milwaukee', 'MIL'],
+    'Twins': ['Minnesota Twins', 'MIN Twins', 'Minnesota', 'MIN'],
+    'Mets': ['New York Mets', 'NY Mets', 'NYM Mets', 'NYM'],
+    'Yankees': ['New York Yankees', 'NY Yankees', 'NYY Yankees', 'NYY'],
+    'Athletics': ['Oakland Athletics', 'OAK Athletics', 'Sacramento Athletics', "A's", 'Oakland', 'OAK', 'ATH'],
+    'Phillies': ['Philadelphia Phillies', 'PHI Phillies', 'Philadelphia', 'PHI'],
+    'Pirates': ['Pittsburgh Pirates', 'PIT Pirates', 'Pittsburgh', 'PIT'],
+    'Padres': ['San Diego Padres', 'SD Padres', 'San Diego', 'SD', 'SDP'],
+    'Giants': ['San Francisco Giants', 'SF Giants', 'San Francisco', 'SF', 'SFG'],
+    'Mariners': ['Seattle Mariners', 'SEA Mariners', 'Seattle', 'SEA'],
+    'Cardinals': ['St. Louis Cardinals', 'STL Cardinals', 'St Louis', 'STL'],
+    'Rays': ['Tampa Bay Rays', 'TB Rays', 'Tampa Bay', 'TB', 'TBR'],
+    'Rangers': ['Texas Rangers', 'TEX Rangers', 'Texas', 'TEX'],
+    'Blue Jays': ['Toronto Blue Jays', 'TOR Blue Jays', 'Toronto', 'TOR'],
+    'Nationals': ['Washington Nationals', 'WSH Nationals', 'Washington', 'WSH', 'WAS'],
+}
+
+
+def normalize(name):
+    # Lower case, no accents, and only letters and digits separated by single spaces
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r"[^a-z0-9]+", ' ', name.lower().replace("'", '')).split())
+
+
+def last_name(name):
+    # Default for names that are not in the alias index, such as tennis players
+    return normalize(name).split(' ')[-1]
+
+
+class NameResolver(object):
+    """Match the team or player names of every sportsbook to one canonical name"""
+
+    def __init__(self, aliases=None, fallback=last_name, cache_size=4096, cutoff=0.85):
+        self.fallback, self.cache_size, self.cutoff = fallback, cache_size, cutoff
+
+        # Resolved names, most recently used last
+        # The scraper threads of every sportsbook share the cache, so it is only changed under the lock
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits, self.misses, self.fuzzy = 0, 0, 0
+
+        # Precomputed index, so resolving a name is a few hash lookups
+        self.exact, self.normalized, self.tokens = dict(), dict(), dict()
+        for canonical, names in (aliases or dict()).items():
+            self.add(canonical, *names)
+
+    def __getstate__(self):
+        # Copies and pickles get a lock of their own
+        state = dict(self.__dict__)
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def add(self, canonical, *names):
+        for name in (canonical,) + names:
+            self.exact[name] = canonical
+            self.normalized[normalize(name)] = canonical
+            for token in normalize(name).split(' '):
+                self.tokens.setdefault(token, set()).add(canonical)
+        with self.lock:
+            self.cache.clear()
+
+    def lookup(self, name):
+        # Exact, then normalized, then the canonical name sharing the most distinctive words with the name
+        if name in self.exact:
+            return self.exact[name]
+
+        key = normalize(name)
+        if key in self.normalized:
+            return self.normalized[key]
+
+        scores = dict()
+        for token in key.split(' '):
+            for canonical in self.tokens.get(token, ()):
+                # A word used by fewer teams says more about which team it is
+                scores[canonical] = scores.get(canonical, 0) + 1 / len(self.tokens[token])
+        if scores:
+            ranked = sorted(scores.items(), key=lambda item: -item[1])
+            if len(ranked) == 1 or ranked[0][1] > ranked[1][1]:
+                return ranked[0][0]
+
+        # Only reached on a cache miss with no indexed match, so the slow fuzzy match stays off the hot path
+        close = difflib.get_close_matches(key, self.normalized.keys(), n=1, cutoff=self.cutoff)
+        if close:
+            self.fuzzy += 1
+            return self.normalized[close[0]]
+
+        return self.fallback(name)
+
+    def resolve(self, name):
+        with self.lock:
+            if name in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(name)
+                return self.cache[name]
+            self.misses += 1
+
+        # The lookup runs outside the lock, so a slow fuzzy match does not hold up the other threads
+        canonical = self.lookup(name)
+        with self.lock:
+            self.cache[name] = canonical
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return canonical
+
+    def metrics(self):
+        lookups = self.hits + self.misses
+        return {'name_cache_hits': self.hits,
+                'name_cache_misses': self.misses,
+                'name_fuzzy_matches': self.fuzzy,
+                'name_cache_hit_rate': self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,88 @@
+import json
+import time
+
+# Read the odds from the JSON the sportsbook websites download over XHR / fetch and WebSockets,
+# instead of waiting for the page to render them and reading them back through XPath
+# Chrome's performance log carries the DevTools Protocol (CDP) Network events, so nothing has to run in the page
+# Each book has a parser in books.py, parse_payload(), that turns a payload into cells: (team1, team2, market, side, wager text)
+# with the wager text written the way the website shows it ('+1.5 -120', 'O 8.5 -110', '+150')
+
+
+def enable(options):
+    # Add to the ChromeOptions before the browser starts
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+class NetworkFeed(object):
+    """Latest odds of one sportsbook, built from the network payloads of its page"""
+
+    def __init__(self, driver, parse, two_person, max_age=600, record=None):
+        self.driver, self.parse, self.two_person, self.max_age = driver, parse, two_person, max_age
+        # Every payload is appended to the record file, one JSON per line, so network_stub.py can serve them again
+        self.record = open(record, 'a') if record else None
+        self.board = dict()  # (team1, team2) -> event in the l1 / l2 shape
+        self.updated = dict()  # (team1, team2) -> time of the last payload for the event
+        self.pending = dict()  # requestId -> url of a JSON response that has not finished loading
+        self.driver.execute_cdp_cmd('Network.enable', {})
+
+    def payloads(self):
+        # JSON payloads received since the last poll
+        found = []
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method, params = message.get('method'), message.get('params', dict())
+
+            if method == 'Network.responseReceived':
+                if 'json' in params.get('response', dict()).get('mimeType', ''):
+                    self.pending[params['requestId']] = params['response'].get('url', '')
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.pending:
+                self.pending.pop(params['requestId'])
+                try:
+                    found.append(self.driver.execute_cdp_cmd('Network.getResponseBody',
+                                                             {'requestId': params['requestId']})['body'])
+                except Exception:
+                    # The body is gone if the page navigated away
+                    pass
+            elif method == 'Network.webSocketFrameReceived':
+                found.append(params.get('response', dict()).get('payloadData', ''))
+
+        for payload in found:
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                # Not JSON, such as WebSocket heartbeats
+                continue
+            if self.record:
+                self.record.write(json.dumps(payload) + '\n')
+                self.record.flush()
+            yield payload
+
+    def apply(self, cells):
+        # Write cells into the board, returns the events that changed
+        changed = set()
+        for team1, team2, market, side, wager in cells:
+            event = self.board.get((team1, team2))
+            if event is None:
+                event = ['', '', team1, team2] if self.two_person else [['', ''], ['', ''], ['', ''], team1, team2]
+                self.board[(team1, team2)] = event
+
+            if self.two_person:
+                if market == 0:
+                    event[side] = wager
+            else:
+                event[market][side] = wager
+            self.updated[(team1, team2)] = time.time()
+            changed.add((team1, team2))
+        return changed
+
+    def poll(self):
+        # Read every payload since the last poll into the board, and drop events with no news for max_age seconds
+        changed = set()
+        for payload in self.payloads():
+            changed |= self.apply(self.parse(payload, self.two_person))
+
+        for event in [event for event, updated in self.updated.items() if time.time() - updated > self.max_age]:
+            del self.board[event], self.updated[event]
+            changed.add(event)
+        return changed
@@ -0,0 +1,57 @@
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Serve recorded sportsbook payloads to a browser, to check network_feed.py and the parse_payload() of a book
+# without the real website
+#   python network_stub.py payloads/fanduel_tennis.jsonl 8000
+# The page fetches the next payload of the file every interval, and starts again at the top when it runs out
+# Record payloads with NetworkFeed(..., record='file.jsonl'), one JSON per line
+# Point a sportsbook at the stub with App.urls, i.e. {'FanDuel': 'http://localhost:8000/live'}
+
+PAGE = '''<html><body>
+<a role="tab" href="/live"><span>Tennis</span></a><a role="tab" href="/live"><span>Baseball</span></a>
+<pre id="payload"></pre>
+<script>
+setInterval(async () => {
+    const response = await fetch('/payload');
+    document.getElementById('payload').innerText = (await response.text()).slice(0, 500);
+}, %d);
+</script>
+</body></html>'''
+
+
+def handler(payloads, interval):
+    class Handler(BaseHTTPRequestHandler):
+        count = 0
+
+        def do_GET(self):
+            if self.path == '/payload':
+                body, content_type = payloads[Handler.count % len(payloads)], 'application/json'
+                Handler.count += 1
+            else:
+                body, content_type = PAGE % interval, 'text/html'
+
+            body = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(path, port=8000, interval=500):
+    with open(path) as file:
+        payloads = [json.dumps(json.loads(line)) for line in file if line.strip()]
+    server = ThreadingHTTPServer(('localhost', port), handler(payloads, interval))
+    print('Serving', len(payloads), 'payloads on http://localhost:' + str(port) + '/live')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1], *[int(arg) for arg in sys.argv[2:4]])
@@ -0,0 +1,147 @@
+# Push based odds feed
+# A MutationObserver installed in the sportsbook page re-reads the board with the board_scripts extractor whenever
+# the page changes, and queues only the wagers that moved. Python drains the queue with one execute_script call,
+# so a scan that finds nothing new costs one small round trip instead of a full scrape
+# The queue keeps only the latest change of each wager (and of each new or removed event), so while nothing drains
+# it (scanning stopped, or a long placement) it never grows past the size of the board
+# Every change is [team1, team2, market, side, price, timestamp in ms]
+#   market -1:   the event is no longer live
+#   market None: a new event, price holds the whole event in the l1 / l2 shape
+
+INSTALL = """
+var extract = function() {
+// board extractor
+};
+
+var cells = function(event) {
+    // Flatten an event into [market, side, price] cells, two person events have a single market
+    var found = [];
+    var markets = event.slice(0, -2);
+    if (Array.isArray(markets[0])) {
+        for (var m = 0; m < markets.length; m++) {
+            for (var s = 0; s < markets[m].length; s++) {
+                found.push([m, s, markets[m][s]]);
+            }
+        }
+    } else {
+        for (var s = 0; s < markets.length; s++) {
+            found.push([0, s, markets[s]]);
+        }
+    }
+    return found;
+};
+
+var queue = function(key, change) {
+    // Keep only the latest change of a wager (key|cell) or event (key|*)
+    // A new or removed event replaces its wager changes, and a wager of a new event that was not drained yet
+    // moves the new event instead
+    var event = window.__arbFeed[key + '|*'];
+    if (change[2] === null || change[2] === -1) {
+        for (var name in window.__arbFeed) {
+            if (name.lastIndexOf(key + '|', 0) === 0) {
+                delete window.__arbFeed[name];
+            }
+        }
+        window.__arbFeed[key + '|*'] = change;
+    } else if (event && event[2] === null) {
+        window.__arbFeed[key + '|*'] = [change[0], change[1], null, null, change[6], change[5]];
+    } else {
+        window.__arbFeed[key + '|' + change[2] + '|' + change[3]] = change.slice(0, 6);
+    }
+};
+
+var snapshot = function() {
+    var now = Date.now();
+    var board = extract() || [];
+    var seen = {};
+    for (var i = 0; i < board.length; i++) {
+        var event = board[i];
+        var team1 = event[event.length - 2], team2 = event[event.length - 1];
+        var key = team1 + '|' + team2;
+        var prices = cells(event);
+        var last = window.__arbLast[key];
+        seen[key] = true;
+
+        if (!last) {
+            queue(key, [team1, team2, null, null, event, now]);
+        } else {
+            for (var c = 0; c < prices.length; c++) {
+                if (!last[c] || last[c][2] !== prices[c][2]) {
+                    queue(key, [team1, team2, prices[c][0], prices[c][1], prices[c][2], now, event]);
+                }
+            }
+        }
+        window.__arbLast[key] = prices;
+    }
+    for (var key in window.__arbLast) {
+        if (!seen[key]) {
+            var teams = key.split('|');
+            queue(key, [teams[0], teams[1], -1, -1, null, now]);
+            delete window.__arbLast[key];
+        }
+    }
+};
+
+if (window.__arbObserver) {
+    window.__arbObserver.disconnect();
+}
+window.__arbFeed = {};
+window.__arbLast = {};
+snapshot();
+window.__arbFeed = {};
+
+// Mutations come in bursts, so re-read the board once per burst
+var pending = false;
+window.__arbObserver = new MutationObserver(function() {
+    if (!pending) {
+        pending = true;
+        setTimeout(function() {
+            pending = false;
+            snapshot();
+        }, 0);
+    }
+});
+window.__arbObserver.observe(document.body, {subtree: true, childList: true, characterData: true, attributes: true, attributeFilter: ['class']});
+"""
+
+DRAIN = """
+if (!window.__arbObserver) {
+    return null;
+}
+var deltas = [];
+for (var name in window.__arbFeed) {
+    deltas.push(window.__arbFeed[name]);
+}
+window.__arbFeed = {};
+return deltas;
+"""
+
+
+def drain(driver, script):
+    # Return the changes queued since the last drain
+    # Returns None when the page has no observer yet (first scan or the page reloaded) and installs one,
+    # so the caller knows it has to read the full board
+    deltas = driver.execute_script(DRAIN)
+    if deltas is None:
+        driver.execute_script(INSTALL.replace('// board extractor', script))
+    return deltas
+
+
+def apply(board, deltas, team_name):
+    # Apply the changes to a board kept between scans, keyed the same way as l1 / l2
+    # Returns the keys of the events that changed
+    changed = set()
+    for team1, team2, market, side, price, stamp in deltas:
+        key = team_name(team1).lower() + " vs " + team_name(team2).lower()
+        changed.add(key)
+
+        if market == -1:
+            board.pop(key, None)
+        elif market is None:
+            board[key] = price
+        elif key in board:
+            if isinstance(board[key][0], list):
+                board[key][market][side] = price
+            else:
+                board[key][side] = price
+    return changed
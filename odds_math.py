@@ -0,0 +1,143 @@
+import collections
+import functools
+
+import numpy as np
+
+
+def to_decimal(odds):
+    # Convert American odds (+150, -120) to decimal prices (2.50, 1.83)
+    # Disabled wagers are scraped as 0, which becomes a price of 1.0 and can never be an arbitrage
+    odds = np.asarray(odds, dtype=float)
+    return np.where(odds < 0, 1 + 100 / -np.where(odds < 0, odds, -100), 1 + odds / 100)
+
+
+def two_way(price1, price2, bet_amount, decimals=2):
+    # Closed form of the Nash equilibrium of [[price1 - 1, -1], [-1, price2 - 1]]
+    # Each stake is proportional to the other side's price, so both sides pay out the same amount
+    # Works on scalars or on whole boards, e.g. arrays shaped (events, markets)
+    price1, price2 = np.asarray(price1, dtype=float), np.asarray(price2, dtype=float)
+
+    stake1 = np.round(bet_amount * price2 / (price1 + price2), decimals)
+    stake2 = np.round(bet_amount * price1 / (price1 + price2), decimals)
+    total = stake1 + stake2
+
+    payout1, payout2 = stake1 * price1, stake2 * price2
+
+    # Make sure both bets have a positive return
+    is_arb = (payout1 > total) & (payout2 > total)
+
+    # Guaranteed return, averaged over both outcomes once the stakes have been rounded
+    profit = (payout1 + payout2) / 2 - total
+
+    return np.stack([stake1, stake2], axis=-1), profit, is_arb
+
+
+def cross_sides(ask_prices, bid_prices):
+    # Pair side i of the ask book with side 1 - i of the bid book for every event and market
+    # Both arrays are shaped (..., 2), the result is a pair of arrays shaped (..., 2)
+    ask_prices, bid_prices = np.asarray(ask_prices, dtype=float), np.asarray(bid_prices, dtype=float)
+    return ask_prices, bid_prices[..., ::-1]
+
+
+def pad(markets, fill=np.nan):
+    # Stack ragged markets into one array shaped (markets, books, outcomes)
+    # Each market is a list of outcome prices, or a list of those per book
+    # Missing books and outcomes are filled with NaN, and the number of outcomes per market is returned with it
+    markets = [np.atleast_2d(np.asarray(market, dtype=float)) for market in markets]
+    books = max((market.shape[0] for market in markets), default=0)
+    width = max((market.shape[1] for market in markets), default=0)
+
+    prices = np.full((len(markets), books, width), fill)
+    outcomes = np.zeros(len(markets), dtype=int)
+    for n, market in enumerate(markets):
+        prices[n, :market.shape[0], :market.shape[1]] = market
+        outcomes[n] = market.shape[1]
+
+    return prices, outcomes
+
+
+def n_way(prices, bet_amount, outcomes=None, decimals=2):
+    # Check every market for an arbitrage at once, whatever the number of outcomes (2 way, 3 way soccer, futures)
+    # prices are decimal prices shaped (markets, books, outcomes), or (markets, outcomes) for a single book
+    # outcomes is the number of real outcomes per market, the columns after it are padding. NaN means not offered
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 2:
+        prices = prices[:, None, :]
+    width = prices.shape[2]
+    if outcomes is None:
+        outcomes = np.full(prices.shape[0], width)
+    valid = np.arange(width) < np.asarray(outcomes)[:, None]
+
+    # Best price for each outcome across all books
+    offered = np.where(np.isnan(prices), -np.inf, prices)
+    best_book = offered.argmax(axis=1)
+    best_price = np.take_along_axis(offered, best_book[:, None, :], axis=1)[:, 0, :]
+    offered = valid & (best_price > 1)
+    best_book = np.where(offered, best_book, -1)
+    best_price = np.where(offered, best_price, np.nan)
+
+    # Stake each outcome in proportion to its implied probability, so every outcome pays out the same amount
+    implied = np.where(offered, 1 / np.where(offered, best_price, 1), 0.0)
+    implied_sum = implied.sum(axis=1, keepdims=True)
+    stakes = np.round(bet_amount * implied / np.where(implied_sum > 0, implied_sum, 1), decimals)
+    total = stakes.sum(axis=1)
+
+    payout = np.where(valid, np.where(offered, stakes * best_price, 0.0), np.inf)
+    margin = (payout.min(axis=1) - total) / np.where(total > 0, total, 1)
+
+    # Make sure every bet has a positive return
+    # A real outcome that no book offers pays out nothing, so that market is never an arbitrage
+    is_arb = (payout > total[:, None]).all(axis=1)
+
+    return best_book, best_price, stakes, margin, is_arb
+
+
+CACHE_SIZE = 100000  # Wager texts to keep parsed, the least recently used go first once it is full
+
+Wager = collections.namedtuple('Wager', ['line', 'american', 'odds'])
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def read_wager(text):
+    # The line and odds of a wager as the website shows it
+    #   '+1.5 −120' -> (1.5, -120, 83.33), 'O 8.5 -110' -> (8.5, -110, 90.91), 'PK -110' -> (0, -110, 90.91),
+    #   '+150' -> (nan, 150, 150)
+    # line keeps the sign of a spread (-1.5) and is NaN for a moneyline, american is 0 for a disabled wager ('') or
+    # odds that can not be read, odds is the same as a positive number, which is what the odds limit is compared with
+    # Boards show the same few hundred texts scan after scan, so each text is read once and then looked up
+    # (lru_cache is safe to share between threads)
+    # Moneylines and disabled wagers are checked for first, raising ValueError for them would cost more than the rest
+    wager = text.replace('−', '-').split(' ')
+    price = wager.pop()
+    line = ''.join(wager).lstrip('OoUu')
+    try:
+        # A pick'em spread ('PK -110') has a line of 0
+        line = float(line) if line else np.nan
+    except ValueError:
+        line = 0.0 if line.upper() == 'PK' else np.nan
+    if not price:
+        american = 0
+    elif price.upper() == 'EVEN':
+        american = 100
+    else:
+        try:
+            american = int(float(price))
+        except ValueError:
+            american = 0
+    return Wager(line, american, 100 / -american * 100 if american < 0 else american)
+
+
+def parse_wagers(texts):
+    # Parse every wager of a board into arrays with read_wager()
+    #   ['+1.5 −120', 'O 8.5 -110', 'u9 +100', '+150', 'EVEN', ''] ->
+    #   line     [1.5, 8.5, 9, nan, nan, nan]         spreads keep their sign (-1.5), NaN without a line
+    #   american [-120, -110, 100, 150, 100, 0]        0 for disabled wagers
+    #   decimal  [1.83, 1.91, 2, 2.5, 2, nan]          NaN for disabled wagers
+    #   implied  [0.545, 0.524, 0.5, 0.4, 0.5, nan]    probability, 1 / decimal
+    wagers = [read_wager(text) for text in texts]
+    # One column at a time, NumPy reads a list of floats much faster than a list of tuples
+    line = np.array([wager.line for wager in wagers], dtype=float)
+    american = np.array([wager.american for wager in wagers], dtype=float)
+    decimal = to_decimal(american)
+    decimal[american == 0] = np.nan
+    return line, american, decimal, 1 / decimal
@@ -0,0 +1,71 @@
+import time
+
+
+def cells(event):
+    # Flatten an event in the l1 / l2 shape into (market, side, price) cells
+    # Two person events ([wager1, wager2, team1, team2]) have a single market
+    markets = event[:-2]
+    if markets and isinstance(markets[0], list):
+        return [(market, side, price) for market, wagers in enumerate(markets) for side, price in enumerate(wagers)]
+    return [(0, side, price) for side, price in enumerate(markets)]
+
+
+class OddsStore(object):
+    """Latest odds of every book, event, market and side, with the version and time of their last change"""
+
+    def __init__(self):
+        # Every change gets the next version, so the events changed since any version can be looked up
+        self.version = 0
+        self.entries = dict()  # (book, event, market, side) -> [price, version, time changed]
+        self.events = dict()  # book -> {event: [(market, side), ...]}
+        self.log, self.log_start = [], 0  # Event changed at each version after log_start
+
+    def update(self, book, event, market, side, price):
+        # Store a price, returns True if it changed
+        key = (book, event, market, side)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == price:
+            return False
+
+        self.version += 1
+        self.entries[key] = [price, self.version, time.time()]
+        self.log.append(event)
+
+        if entry is None:
+            self.events.setdefault(book, dict()).setdefault(event, []).append((market, side))
+        return True
+
+    def remove(self, book, event):
+        # Forget an event that is no longer live on the book
+        for market, side in self.events.get(book, dict()).pop(event, []):
+            del self.entries[(book, event, market, side)]
+
+        self.version += 1
+        self.log.append(event)
+
+    def update_board(self, book, board, keys=None):
+        # Store a whole board in the l1 / l2 shape, or only the events in keys
+        # Events that are no longer on the board are removed
+        book_events = self.events.get(book, dict())
+        if keys is None:
+            keys = board.keys() | book_events.keys()
+
+        for event in keys:
+            if event in board:
+                for market, side, price in cells(board[event]):
+                    self.update(book, event, market, side, price)
+            elif event in book_events:
+                self.remove(book, event)
+
+    def get(self, book, event, market, side):
+        # Returns [price, version, time changed], or None
+        return self.entries.get((book, event, market, side))
+
+    def changed_since(self, version):
+        # Events with a price that changed after version
+        # Changes up to version are dropped from the log, so keep asking with the latest version you have checked
+        start = max(version - self.log_start, 0)
+        changed = set(self.log[start:])
+        del self.log[:start]
+        self.log_start += start
+        return changed
@@ -1,6 +1,8 @@
 import nashpy as nash
 import numpy as np
 
+import odds_math
+
 
 A = np.array([[165 / 100, -1],
               [-1, 160 / 100]])
@@ -37,4 +39,8 @@ for m in range(len(result)):
     sum_val += sum(result[m] * A[m])
 
 return_val = sum_val/len(result)
-print(return_val, return_val/bet_amount)
\ No newline at end of file
+print(return_val, return_val/bet_amount)
+
+# The same check without a game solver, for any number of outcomes (A[m][m] + 1 is the decimal price)
+best_book, best_price, stakes, margin, is_arb = odds_math.n_way([np.diag(A) + 1], bet_amount, decimals=0)
+print(stakes[0], margin[0], is_arb[0])
\ No newline at end of file
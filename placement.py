@@ -0,0 +1,104 @@
+import concurrent.futures
+import threading
+import time
+
+# Place both legs of an arbitrage at once: select both wagers, check the odds on the betslips, enter both stakes,
+# then submit both. Each step runs on both websites in parallel with its own deadline, so a slow website only
+# holds up its own leg until the deadline. The whole placement also has a budget from the moment the arbitrage
+# was found. If a leg misses a deadline, fails, or the odds have moved, both betslips are cleared so no leg is
+# left behind on its own
+
+DEADLINES = {'select': 5, 'stake': 3, 'submit': 5, 'clear': 3}  # Seconds per step
+
+
+class Leg(object):
+    """One wager of an arbitrage: a sportsbook from books.py, its browser, and the event, market and side
+    lock is held for every step: the lock of the browser, so a step that missed its deadline finishes before the
+    rollback or the next placement uses the browser (or a tabs.Tab, which also shows the tab of the sport)
+    Without one, the leg has its own lock, so at least its own steps run one at a time"""
+
+    def __init__(self, name, driver, book, event, market, side, lock=None):
+        self.name, self.driver, self.book = name, driver, book
+        self.event, self.market, self.side = event, market, side
+        self.lock = lock or threading.Lock()
+        self.odds, self.button = '', None
+
+    def select(self):
+        with self.lock:
+            self.odds = self.book.select(self.driver, self.event, self.market, self.side)
+        if not self.odds:
+            raise ValueError('No odds on the betslip')
+        return self.odds
+
+    def stake(self, bet_amount):
+        with self.lock:
+            self.button = self.book.stake(self.driver, bet_amount)
+        if self.button is None:
+            raise ValueError('No Place Bet button')
+        return self.button
+
+    def submit(self):
+        with self.lock:
+            self.book.submit(self.driver, self.button)
+
+    def clear(self):
+        with self.lock:
+            self.book.clear(self.driver)
+
+
+class Coordinator(object):
+    """Runs the steps of both legs together, with deadlines and rollback"""
+
+    def __init__(self, deadlines=None, budget=15, submit=False, metrics=None):
+        self.deadlines = dict(DEADLINES, **(deadlines or dict()))
+        self.budget, self.submit, self.metrics = budget, submit, metrics
+        # Calls that miss their deadline keep their thread until the browser answers, so keep some spare
+        self.executor = concurrent.futures.ThreadPoolExecutor(8)
+
+    def timed(self, step, leg, *args):
+        tic = time.perf_counter()
+        result = getattr(leg, step)(*args)
+        if self.metrics:
+            self.metrics.record(step, time.perf_counter() - tic, leg.name)
+        return result
+
+    def both(self, step, legs, detected, args=((), ())):
+        # Run a step on both legs, returns True if both finished in time and without an error
+        timeout = min(self.deadlines[step], self.budget - (time.perf_counter() - detected))
+        if timeout <= 0:
+            return False
+        futures = [self.executor.submit(self.timed, step, leg, *arg) for leg, arg in zip(legs, args)]
+        done, late = concurrent.futures.wait(futures, timeout)
+        return not late and all(future.exception() is None for future in done)
+
+    def rollback(self, legs):
+        # Clear both betslips, the leg that worked as well as the one that did not
+        # A step that is still running holds the lock of its leg, so the clear runs once it is done
+        futures = [self.executor.submit(self.timed, 'clear', leg) for leg in legs]
+        concurrent.futures.wait(futures, self.deadlines['clear'])
+
+    def place(self, legs, check, detected):
+        # check(odds of both betslips) returns the stake of each leg, or None if the arbitrage is gone
+        # detected is the time.perf_counter() when the arbitrage was found
+        # Returns the step that stopped the placement ('select', 'check', 'stake' or 'submit'), or None if it went through
+        if not self.both('select', legs, detected):
+            self.rollback(legs)
+            return 'select'
+
+        stakes = check([leg.odds for leg in legs])
+        if stakes is None:
+            self.rollback(legs)
+            return 'check'
+
+        if not self.both('stake', legs, detected, [(amount,) for amount in stakes]):
+            self.rollback(legs)
+            return 'stake'
+
+        if self.submit and not self.both('submit', legs, detected):
+            # A wager that went through can not be taken back, but the other betslip is cleared
+            self.rollback(legs)
+            return 'submit'
+
+        if self.metrics:
+            self.metrics.record('place', time.perf_counter() - detected)
+        return None
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+# Runs the scan, the search for arbitrages and the wager placement as independent asyncio tasks
+# A slow step only holds up its own task: selecting, staking and waiting after a wager does not stop the scanning,
+# and nothing waits on a GUI. The scan rate is the interval between scans, not how often a window redraws
+
+
+class Scheduler(object):
+    """Scan every interval seconds, look for arbitrages after each scan, and place them one at a time
+
+    scan() and place(key, arb) are coroutines, evaluate() returns {key: arb} for the latest scan
+    place() does not hold up the next arbitrage: once a wager is placed, its event and market cool down (cooldown.py)
+    and evaluate() leaves them out, while every other arbitrage can be placed straight away
+    ready(key) is checked right before each placement, since the arbitrages of a scan are found before the wagers
+    placed from them start their cooldowns"""
+
+    def __init__(self, scan, evaluate, place, interval=0.01, running=lambda: True, ready=lambda key: True):
+        self.scan, self.evaluate, self.place = scan, evaluate, place
+        self.interval, self.running, self.ready = interval, running, ready
+        self.arbs = dict()  # Arbitrages found by the latest scan
+
+    async def scanner(self, scanned):
+        while True:
+            if self.running():
+                await self.scan()
+                scanned.set()
+            await asyncio.sleep(self.interval)
+
+    async def evaluator(self, scanned, found):
+        while True:
+            await scanned.wait()
+            scanned.clear()
+            self.arbs = self.evaluate()
+            if self.arbs:
+                found.set()
+
+    async def placer(self, found):
+        while True:
+            await found.wait()
+            found.clear()
+            # Only the arbitrages that are still there after the wagers before them are placed, and not those whose
+            # event and market started cooling down after the scan that found them
+            for key in list(self.arbs):
+                if not self.running() or key not in self.arbs or not self.ready(key):
+                    continue
+                await self.place(key, self.arbs[key])
+
+    async def run(self):
+        scanned, found = asyncio.Event(), asyncio.Event()
+        await asyncio.gather(self.scanner(scanned), self.evaluator(scanned, found), self.placer(found))
+
+    def start(self):
+        # Run in a background thread, so a GUI can keep the main thread
+        thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,184 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import best_line
+import odds_math
+import odds_store
+
+# Process mode without sending boards through pipes: the odds of one sport live in a table in shared memory, a NumPy
+# structured array with a record per sportsbook and event slot. Each worker parses its board once and writes the
+# events that changed straight into its own records, and the engine reads the records in place, copying only the
+# slots that changed since it last looked
+# Every record has a sequence number (a seqlock). The worker makes it odd, writes the record, and makes it even again.
+# The engine keeps a record only if the number was even and the same before and after it was copied, otherwise it
+# is read on the next scan. Each record has one writer, so nothing waits on a lock
+#   header, per sportsbook: version (bumped after each board that changed a record), seconds the scrape took
+#   record, per sportsbook and slot: seq, event ('smith vs jones', cut to EVENT bytes, the worker's Writer knows
+#                                    the whole name), and per market and side: decimal price,
+#                                    line (spreads with their sign, NaN for moneylines) and suspended (shown, but can
+#                                    not be wagered on)
+
+MARKETS, SIDES = 3, 2  # Spread, moneyline and total, as in the l1 / l2 shape
+EVENT = 80  # Bytes for the event name
+HEADER = np.dtype([('version', 'u8'), ('seconds', 'f8')])
+RECORD = np.dtype([('seq', 'u8'), ('event', 'S%d' % EVENT), ('price', 'f8', (MARKETS, SIDES)),
+                   ('line', 'f8', (MARKETS, SIDES)), ('suspended', '?', (MARKETS, SIDES))])
+
+
+def cut(event):
+    # An event name as it is stored in a record and read back: at most EVENT bytes, without a broken character
+    return event.encode('utf-8')[:EVENT].decode('utf-8', 'ignore')
+
+
+class OddsTable(object):
+    """Odds of one sport from every sportsbook, in shared memory
+
+    Made by the engine with name=None, then opened in each worker by its name"""
+
+    def __init__(self, books, slots=1024, name=None):
+        # New shared memory starts out as zeros: no events, version 0
+        size = books * (HEADER.itemsize + slots * RECORD.itemsize)
+        self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.name, self.books, self.slots = self.memory.name, books, slots
+        self.header = np.ndarray(books, HEADER, self.memory.buf)
+        self.records = np.ndarray((books, slots), RECORD, self.memory.buf, offset=books * HEADER.itemsize)
+
+    def close(self):
+        # The arrays have to go before the memory can be closed
+        del self.header, self.records
+        self.memory.close()
+
+    def unlink(self):
+        # Remove the table once every process is done with it. Processes that still have it open keep their memory
+        self.memory.unlink()
+
+
+class Writer(object):
+    """The records of one sportsbook in an OddsTable, written by its worker"""
+
+    def __init__(self, table, book):
+        self.table, self.book = table, book
+        self.records, self.header = table.records[book], table.header[book:book + 1]
+        self.slots = dict()  # event -> slot
+        self.free = list(range(table.slots - 1, -1, -1))
+        self.last = dict()  # event -> cells last written
+        self.names = dict()  # event as the engine reads it, cut to EVENT bytes -> event
+        self.full, self.long = False, False
+
+    def event(self, name):
+        # The event of a name the engine read from the table, which is cut short if it did not fit
+        return self.names.get(name, name)
+
+    def store(self, slot, event, cells, lines, prices):
+        # cells of an event, with the line and decimal price of each cell from odds_math.parse_wagers()
+        price = np.full((MARKETS, SIDES), np.nan)
+        line = np.full((MARKETS, SIDES), np.nan)
+        suspended = np.zeros((MARKETS, SIDES), bool)
+        if cells:
+            index = tuple(np.array([(market, side) for market, side, wager in cells]).T)
+            line[index], price[index], suspended[index] = lines, prices, np.isnan(prices)
+
+        seq = self.records['seq']
+        seq[slot] += 1  # Odd, the record is being written
+        self.records['event'][slot] = cut(event).encode('utf-8')
+        self.records['price'][slot] = price
+        self.records['line'][slot] = line
+        self.records['suspended'][slot] = suspended
+        seq[slot] += 1  # Even, the record can be read
+
+    def write(self, board, seconds=0.0):
+        # Write the events of a board (event -> l1 / l2 shape) that changed, and empty the slots of events that
+        # have gone. Returns the number of records written
+        changed = []  # (slot, event, cells)
+        for event in [event for event in self.slots if event not in board]:
+            changed.append((self.slots[event], '', []))
+            self.free.append(self.slots.pop(event))
+            del self.last[event]
+            del self.names[cut(event)]
+
+        for event, wagering in board.items():
+            # Flat cells are a copy, so events that the page or the network feed change in place are still compared
+            cells = odds_store.cells(wagering)
+            if self.last.get(event) == cells:
+                continue
+            if event not in self.slots:
+                if not self.free:
+                    if not self.full:
+                        print('Odds table is full, {} events are left out'.format(len(board) - len(self.slots)))
+                        self.full = True
+                    continue
+                if self.names.get(cut(event), event) != event:
+                    # Long names are cut to EVENT bytes, two events that would read the same are not both kept
+                    if not self.long:
+                        print('Event names are the same in their first {} bytes, {} is left out'.format(EVENT, event))
+                        self.long = True
+                    continue
+                self.slots[event] = self.free.pop()
+                self.names[cut(event)] = event
+            changed.append((self.slots[event], event, cells))
+            self.last[event] = cells
+
+        # Every changed wager is parsed in one call
+        line, american, decimal, implied = odds_math.parse_wagers(
+            wager for slot, event, cells in changed for market, side, wager in cells)
+        n = 0
+        for slot, event, cells in changed:
+            self.store(slot, event, cells, line[n:n + len(cells)], decimal[n:n + len(cells)])
+            n += len(cells)
+
+        written = len(changed)
+        if written:
+            self.header['seconds'] = seconds
+            self.header['version'] += 1
+        return written
+
+
+class Reader(object):
+    """The engine's view of an OddsTable: what each sportsbook has written since the last read"""
+
+    def __init__(self, table):
+        self.table = table
+        self.seen = np.zeros((table.books, table.slots), 'u8')  # seq of each record when it was last read
+        self.events = [dict() for book in range(table.books)]  # slot -> event last read from it
+        self.versions = np.zeros(table.books, 'u8')
+
+    def scraped(self, book):
+        # Seconds the latest scrape of a sportsbook took, or None if it has not written anything since the last call
+        version = self.table.header['version'][book]
+        if version == self.versions[book]:
+            return None
+        self.versions[book] = version
+        return float(self.table.header['seconds'][book])
+
+    def changes(self, book):
+        # [(event, cells)] for every record of a sportsbook that changed, where cells are (market, side, line,
+        # decimal price) as best_line.BestLineTable keeps them, without the suspended wagers, or None if the event
+        # has gone
+        seq = self.table.records['seq'][book]
+        slots = np.flatnonzero(seq != self.seen[book])
+        if not len(slots):
+            return []
+
+        before = seq[slots]
+        rows = self.table.records[book][slots]
+        after = seq[slots]
+        # Records that were being written are read on the next call
+        read = (before == after) & (before % 2 == 0)
+        slots, rows = slots[read], rows[read]
+        self.seen[book][slots] = before[read]
+
+        changes = []
+        for slot, row in zip(slots.tolist(), rows):
+            event = row['event'].decode('utf-8', 'ignore')
+            old = self.events[book].pop(slot, '')
+            if old and old != event:
+                changes.append((old, None))
+            if not event:
+                continue
+            self.events[book][slot] = event
+            markets, sides = np.nonzero(~np.isnan(row['price']))
+            changes.append((event, list(zip(markets.tolist(), sides.tolist(),
+                                            best_line.line_keys(markets, sides, row['line'][markets, sides]),
+                                            row['price'][markets, sides].tolist()))))
+        return changes
@@ -0,0 +1,371 @@
+import argparse
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import name_resolver
+
+# A local sportsbook for load testing: live pages shaped like the DraftKings, FanDuel and William Hill boards,
+# with the same XPaths the programs use to open a sport, read the board, select a wager, enter a stake and place it
+#   python simulator.py --sport Baseball --events 500
+#   http://localhost:8001/draftkings/live, /fanduel/live and /williamhill/live
+# Every book shows the same events under its own team names, and quotes its own odds around one fair price
+# Each tick a few events move on one book only, so the other books lag behind and arbitrages come and go
+# The odds can also be scripted (--script), or set while running: POST /set {"book", "event", "market", "side", "odds"}
+# Placed wagers are listed at /bets, with the time each one was selected and placed, and the events at /events
+# Point the programs at it with App.urls, i.e. {'DraftKings': 'http://localhost:8001/draftkings/live'}
+# With --assets the pages also load what real ones do: a logo per event, a web font, an autoplaying video and an
+# analytics script, to measure what blocking them saves (blocking.py, benchmarks/resources.py)
+
+BOOKS = ['draftkings', 'fanduel', 'williamhill']
+
+FIRST = ['Carlos', 'Jannik', 'Daniil', 'Alexander', 'Casper', 'Holger', 'Iga', 'Coco', 'Elena', 'Jessica', 'Ons',
+         'Maria', 'Taylor', 'Frances', 'Karen', 'Hubert']
+LAST = ['Al', 'Bor', 'Cor', 'Dan', 'Est', 'Fer', 'Gal', 'Hol', 'Ivo', 'Jor', 'Kas', 'Lem', 'Mor', 'Nev', 'Orl',
+        'Pav', 'Qui', 'Ros', 'Sal', 'Tov']
+MIDDLE = ['a', 'e', 'i', 'o', 'u', 'ar', 'el', 'in', 'on', 'us']
+ENDING = ['ez', 'ov', 'son', 'ini', 'ic', 'ard', 'enko', 'uud', 'ova', 'man']
+
+
+def american(price):
+    # Decimal price -> American odds as the websites show them
+    if price >= 2:
+        return '+{:d}'.format(round((price - 1) * 100))
+    return '-{:d}'.format(round(100 / (price - 1)))
+
+
+def quote(probability, rng, margin=0.045, noise=0.02):
+    # Both sides of a market around a fair probability, with the book's margin and its own error
+    probability = min(max(probability + rng.uniform(-noise, noise), 0.05), 0.95)
+    return [american(1 / (probability * (1 + margin / 2))), american(1 / ((1 - probability) * (1 + margin / 2)))]
+
+
+def names(count, sport, rng):
+    # Team or player names of every event as each book shows them, so matching them is part of the test
+    if sport == 'Baseball':
+        teams = list(name_resolver.MLB_TEAMS.items())
+        pairs = [(away, home) for away in teams for home in teams if away != home]
+        rng.shuffle(pairs)
+        # Every ordered pair of teams once (up to 870 events), so no two events share a key
+        # A team plays more than one game with over 15 events, and DraftKings wagers are found by team name,
+        # so a DraftKings selection can land on another game of the same team
+        return [{'draftkings': (away[1][1], home[1][1]), 'fanduel': (away[1][0], home[1][0]),
+                 'williamhill': (away[1][0], home[1][0])} for away, home in pairs[:count]]
+
+    players = ['{} {}{}{}'.format(rng.choice(FIRST), last, middle, ending)
+               for last in LAST for middle in MIDDLE for ending in ENDING]
+    players = rng.sample(players, len(players))
+    events = []
+    for n in range(min(count, len(players) // 2)):
+        one, two = players[2 * n], players[2 * n + 1]
+        short = ['{}. {}'.format(player[0], player.split(' ')[1]) for player in [one, two]]
+        events.append({'draftkings': (one, two), 'fanduel': (one, two), 'williamhill': tuple(short)})
+    return events
+
+
+class Simulator(object):
+    """Events, odds and placed wagers of every book"""
+
+    def __init__(self, sport='Baseball', events=100, moves=5, tick=0.5, script=None, seed=1):
+        self.sport, self.two_person = sport, sport != 'Baseball'
+        self.moves, self.tick, self.script = moves, tick, sorted(script or [], key=lambda step: step['t'])
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.bets, self.start = [], time.time()
+
+        self.names = names(events, sport, self.rng)
+        self.fair = [self.rng.uniform(0.3, 0.7) for event in self.names]
+        self.lines = [self.rng.choice([7.5, 8.5, 8.5, 9.5, 10.5]) for event in self.names]
+        # book -> event -> market -> side -> wager as the website shows it, '' for a disabled wager
+        self.odds = {book: [self.quote(n) for n in range(len(self.names))] for book in BOOKS}
+
+    def quote(self, n):
+        moneyline = quote(self.fair[n], self.rng)
+        if self.two_person:
+            return [moneyline]
+        # The underdog gets +1.5 runs
+        underdog = 0 if self.fair[n] < 0.5 else 1
+        spread = quote(min(self.fair[n] + [0.2, -0.2][underdog], 0.9), self.rng)
+        spread = ['{}1.5 {}'.format('+' if side == underdog else '-', spread[side]) for side in range(2)]
+        total = quote(0.5, self.rng)
+        total = ['{} {:g} {}'.format('OU'[side], self.lines[n], total[side]) for side in range(2)]
+        return [spread, moneyline, total]
+
+    def move(self):
+        # A few events get a new fair price, but only one book has caught up with it
+        with self.lock:
+            for n in self.rng.sample(range(len(self.names)), min(self.moves, len(self.names))):
+                self.fair[n] = min(max(self.fair[n] + self.rng.uniform(-0.03, 0.03), 0.1), 0.9)
+                book = self.rng.choice(BOOKS)
+                self.odds[book][n] = self.quote(n)
+                # Now and then a market is suspended
+                if self.rng.random() < 0.05:
+                    self.odds[book][n][self.rng.randrange(len(self.odds[book][n]))] = ['', '']
+
+            while self.script and self.script[0]['t'] <= time.time() - self.start:
+                self.set(**self.script.pop(0))
+
+    def set(self, book, event, market, side, odds, t=None):
+        self.odds[book][event][market][side] = odds
+
+    def cells(self, book):
+        # Cell id -> html of every wager on a book's page
+        with self.lock:
+            return {'{}-{}-{}'.format(n, market, side): wager or DISABLED
+                    for n, markets in enumerate(self.odds[book])
+                    for market, wagers in enumerate(markets) for side, wager in enumerate(wagers)}
+
+    def run(self):
+        while True:
+            time.sleep(self.tick)
+            self.move()
+
+
+DISABLED = '<span class="disabled"></span>'
+
+
+def tabs(book):
+    # The sport tabs each book's open_sport() clicks
+    link = {'draftkings': '<a role="tab" href="/draftkings/live"><span>{}</span></a>',
+            'fanduel': '<a href="/fanduel/live"><span>{}</span></a>',
+            'williamhill': '<span class="pill-title">{}</span>'}[book]
+    return ''.join(link.format(sport) for sport in ['Baseball', 'Tennis', 'Basketball'])
+
+
+def draftkings(simulator, cells):
+    if not simulator.two_person:
+        rows = []
+        for n, teams in enumerate(simulator.names):
+            for side in range(2):
+                # The columns are spread, total, moneyline
+                rows.append('<tr><th><div class="event-cell__name-text">{}</div></th>{}</tr>'.format(teams['draftkings'][side], ''.join(
+                    '<td class="sportsbook-table__column-row" data-cell="{0}" data-odds="{0}">{1}</td>'.format(
+                        '{}-{}-{}'.format(n, market, side), cells['{}-{}-{}'.format(n, market, side)]) for market in [0, 2, 1])))
+        return '<table><tbody class="sportsbook-table__body">{}</tbody></table>'.format(''.join(rows))
+
+    events = []
+    for n, teams in enumerate(simulator.names):
+        outcomes = ''.join(
+            '<div data-cell="{0}"><div class="sportsbook-outcome-cell__body"><div class="sportsbook-outcome-cell__elements" '
+            'data-odds="{0}">{1}</div></div></div>'.format('{}-0-{}'.format(n, side), cells['{}-0-{}'.format(n, side)])
+            for side in range(2))
+        events.append('<div class="sportsbook-event-accordion__wrapper" aria-label="Featured Accordion" aria-expanded="true">'
+                      '<div><div class="live-score-body__row--team">{}</div><div class="live-score-body__row--team">{}</div>'
+                      '<div><div>{}</div></div></div></div>'.format(teams['draftkings'][0], teams['draftkings'][1], outcomes))
+    return ''.join(events)
+
+
+def fanduel(simulator, cells):
+    events = []
+    for n, teams in enumerate(simulator.names):
+        one, two = teams['fanduel']
+        if not simulator.two_person:
+            title = one + ' @ ' + two
+            link = ('<div><div style="background-image: url(/logo.png)"></div><div><span>{}</span><span>{}</span></div>'
+                    '</div>').format(one, two)
+            rows = ''.join('<div>{}</div>'.format(''.join(
+                '<div data-cell="{0}" data-odds="{0}">{1}</div>'.format('{}-{}-{}'.format(n, market, side),
+                                                                      cells['{}-{}-{}'.format(n, market, side)])
+                for market in range(3))) for side in range(2))
+        else:
+            title = one + ' v ' + two
+            link = ''.join('<div><div></div><div><div><span>{}</span></div></div></div>'.format(name) for name in [one, two])
+            rows = ''.join('<div data-cell="{0}" data-odds="{0}">{1}</div>'.format(
+                '{}-0-{}'.format(n, side), cells['{}-0-{}'.format(n, side)]) for side in range(2))
+        events.append('<div><a target="_self" title="{}" href="#">{}</a><div>{}</div></div>'.format(title, link, rows))
+    return '<div><a target="_self" title="Live events" href="#">{} live events</a>{}</div>'.format(len(events), ''.join(events))
+
+
+def williamhill(simulator, cells):
+    # Only moneylines, the same as the two person board that has been mapped
+    events = []
+    for n, teams in enumerate(simulator.names):
+        market = 0 if simulator.two_person else 1
+        events.append('<div class="groupedMarketTemplateGrid">{}</div>'.format(''.join(
+            '<div class="teamNameContainer">{}</div><div class="selectionContainer"><button data-cell="{}" data-odds="{}">{}'
+            '</button></div>'.format(teams['williamhill'][side], '{}-{}-{}'.format(n, market, side),
+                                     '{}-{}-{}'.format(n, market, side), cells['{}-{}-{}'.format(n, market, side)])
+            for side in range(2))))
+    return ''.join(events)
+
+
+# Betslip of each book: a selection ({id}, {odds}), and the stake input with the Place Bet button
+SLIPS = {
+    'draftkings': ('<div class="betslip-outcome-card"><div aria-label="Close" role="img" class="remove" data-sel="{id}">x</div>'
+                   '<div class="betslip-odds__display-standard"><span data-slip="{id}">{odds}</span></div></div>',
+                   '<input name="stake"><div class="place-bet-button__wrapper place">Place Bet</div>'),
+    'fanduel': ('<ul><li class="remove" data-sel="{id}"><span id="remove-circle-{id}">x</span>'
+                '<div style="transform: none;" data-slip="{id}">{odds}</div></li></ul>',
+                '<div><span>WAGER</span><input></div><div class="place"><div><div><div><span>Place 1 bet</span></div></div>'
+                '</div></div>'),
+    'williamhill': ('<div><span class="betslipSectionOdds"><span data-slip="{id}">{odds}</span></span>'
+                    '<button data-qa="remove-bet-button" class="remove" data-sel="{id}">x</button></div>',
+                    '<input data-qa="betslip-input-field-desktop"><button data-qa="place-bet-button" class="place">Place Bet'
+                    '</button>'),
+}
+
+PAGE = '''<html><body>
+%(assets)s
+<div>%(tabs)s</div>
+<div id="board">%(board)s</div>
+<div id="betslip"></div>
+<script>
+const book = '%(book)s', item = %(item)s, footer = %(footer)s;
+let odds = %(cells)s, slip = [];
+
+function text(id) {
+    return odds[id].indexOf('disabled') >= 0 ? '' : odds[id];
+}
+
+function render() {
+    document.getElementById('betslip').innerHTML = slip.length ? slip.map(
+        s => item.split('{id}').join(s.id).split('{odds}').join(text(s.id))).join('') + footer : '';
+}
+
+document.addEventListener('click', event => {
+    const wager = event.target.closest('[data-cell]'), remove = event.target.closest('.remove'),
+          place = event.target.closest('.place');
+    if (wager && text(wager.dataset.cell) && !slip.some(s => s.id == wager.dataset.cell)) {
+        slip.push({id: wager.dataset.cell, selected: Date.now()});
+        render();
+    } else if (remove) {
+        slip = slip.filter(s => s.id != remove.dataset.sel);
+        render();
+    } else if (place) {
+        const stake = document.querySelector('#betslip input').value;
+        for (const s of slip) {
+            fetch('/' + book + '/bet', {method: 'POST', body: JSON.stringify(
+                {id: s.id, odds: text(s.id), stake: stake, selected: s.selected, placed: Date.now()})});
+        }
+        slip = [];
+        render();
+    }
+});
+
+// Update the wagers that changed in place, the way the live pages do
+setInterval(async () => {
+    const latest = await (await fetch('/' + book + '/odds')).json();
+    for (const id in latest) {
+        if (latest[id] != odds[id]) {
+            odds[id] = latest[id];
+            const el = document.querySelector('[data-odds="' + id + '"]');
+            if (el) el.innerHTML = latest[id];
+            const selected = document.querySelector('[data-slip="' + id + '"]');
+            if (selected) selected.innerText = text(id);
+        }
+    }
+}, %(interval)d);
+</script>
+</body></html>'''
+
+
+def png(size, seed):
+    # A valid PNG of random pixels, so the browser has to download and decode all of it
+    rng = random.Random(seed)
+    rows = b''.join(b'\x00' + rng.randbytes(size * 4) for row in range(size))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 6, 0, 0, 0)) + \
+        chunk(b'IDAT', zlib.compress(rows, 1)) + chunk(b'IEND', b'')
+
+
+# The tracker is served under the path of a real analytics host, so the same blocklist matches it
+ASSETS = {
+    'logo': ('image/png', [png(192, seed) for seed in range(16)]),
+    'book.woff2': ('font/woff2', random.Random(1).randbytes(200000)),
+    'promo.mp4': ('video/mp4', random.Random(2).randbytes(2000000)),
+    'analytics.js': ('application/javascript', b"setInterval(() => navigator.sendBeacon("
+                     b"'/www.google-analytics.com/collect', JSON.stringify({t: Date.now(), y: scrollY})), 1000);"),
+}
+
+
+def assets(simulator):
+    return ('<style>@font-face {font-family: Book; src: url(/static/book.woff2)} body {font-family: Book}</style>'
+            '<script src="/www.google-analytics.com/analytics.js"></script>'
+            '<video src="/static/promo.mp4" autoplay muted loop></video>'
+            '<div>' + ''.join('<img src="/static/logo/{}.png">'.format(n) for n in range(len(simulator.names))) + '</div>')
+
+
+def page(simulator, book, interval, heavy=False):
+    cells = simulator.cells(book)
+    board = {'draftkings': draftkings, 'fanduel': fanduel, 'williamhill': williamhill}[book](simulator, cells)
+    item, footer = SLIPS[book]
+    return PAGE % {'assets': assets(simulator) if heavy else '', 'tabs': tabs(book), 'board': board, 'book': book,
+                   'item': json.dumps(item), 'footer': json.dumps(footer), 'cells': json.dumps(cells),
+                   'interval': interval}
+
+
+def handler(simulator, interval, heavy=False):
+    class Handler(BaseHTTPRequestHandler):
+        def send(self, body, content_type='application/json'):
+            body = body if isinstance(body, bytes) else body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = self.path.split('?')[0].strip('/').split('/')
+            if parts[0] == 'bets':
+                self.send(json.dumps(simulator.bets))
+            elif parts[0] == 'events':
+                # The names of every event on every book, to check the matching against
+                self.send(json.dumps(simulator.names))
+            elif parts[0] in BOOKS and parts[-1] == 'odds':
+                self.send(json.dumps(simulator.cells(parts[0])))
+            elif parts[0] in BOOKS:
+                self.send(page(simulator, parts[0], interval, heavy), 'text/html')
+            elif parts[-1] in ASSETS:
+                self.send(ASSETS[parts[-1]][1], ASSETS[parts[-1]][0])
+            elif len(parts) > 1 and parts[-2] == 'logo':
+                # Every event has its own logo URL, so none of them come from the cache of another
+                content_type, logos = ASSETS['logo']
+                self.send(logos[int(parts[-1].split('.')[0]) % len(logos)], content_type)
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            data = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or '{}')
+            parts = self.path.strip('/').split('/')
+            if parts[0] == 'set':
+                with simulator.lock:
+                    simulator.set(**data)
+            elif parts[0] in BOOKS and parts[-1] == 'bet':
+                n, market, side = [int(part) for part in data['id'].split('-')]
+                data.update(book=parts[0], event=simulator.names[n][parts[0]], market=market, side=side)
+                with simulator.lock:
+                    simulator.bets.append(data)
+            self.send('{}')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local sportsbook simulator')
+    parser.add_argument('--sport', default='Baseball', help='Baseball, or any two person sport such as Tennis')
+    parser.add_argument('--events', type=int, default=100, help='Live events, 10 to 1000')
+    parser.add_argument('--moves', type=int, default=5, help='Events that move each tick')
+    parser.add_argument('--tick', type=float, default=0.5, help='Seconds between odds moves')
+    parser.add_argument('--script', help='JSON list of odds changes: {"t", "book", "event", "market", "side", "odds"}')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--assets', action='store_true', help='Pages also load logos, a font, a video and a tracker')
+    args = parser.parse_args()
+
+    script = json.load(open(args.script)) if args.script else None
+    simulator = Simulator(args.sport, args.events, args.moves, args.tick, script, args.seed)
+    threading.Thread(target=simulator.run, daemon=True).start()
+
+    server = ThreadingHTTPServer(('localhost', args.port), handler(simulator, int(simulator.tick * 1000), args.assets))
+    print('{} {} events on http://localhost:{}/<book>/live for {}'.format(
+        len(simulator.names), args.sport, args.port, ', '.join(BOOKS)))
+    server.serve_forever()
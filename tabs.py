@@ -0,0 +1,76 @@
+import blocking
+import elements
+
+# More than one sport per sportsbook: every sport gets its own tab in the browser of the sportsbook, so covering
+# baseball, tennis and more costs a tab each instead of another Chrome with its own login
+# A browser can only read the tab it shows, so scanning and placing switch to the tab of their sport first, and
+# Rotation decides which sport is scanned next
+
+# Chrome slows down the timers and rendering of tabs that are not shown, and after a few minutes runs their timers
+# only once a minute. The odds in those tabs would stop moving until the tab is shown again
+FLAGS = ['--disable-background-timer-throttling', '--disable-backgrounding-occluded-windows',
+         '--disable-renderer-backgrounding']
+
+
+def prefs(options):
+    # Add to the ChromeOptions before the browser starts
+    for flag in FLAGS:
+        options.add_argument(flag)
+    return options
+
+
+def open_tab(driver, url, blocked=()):
+    # Open url in a new tab and show it, returns the window handle of the tab
+    # The blocklist (blocking.py) is set per tab, so it is set while the new tab is still blank, before url loads
+    driver.switch_to.new_window('tab')
+    elements.shown[driver] = driver.current_window_handle
+    blocking.block(driver, blocked)
+    driver.get(url)
+    return elements.shown[driver]
+
+
+def show(driver, handle):
+    # Switch the browser to a tab, only if it is showing another one
+    if elements.shown.get(driver) != handle:
+        driver.switch_to.window(handle)
+        elements.shown[driver] = handle
+
+
+class Tab(object):
+    """The tab of one sport in a browser. with tab: holds the lock of the browser and shows the tab,
+    so scanning and placing in other tabs of the same browser wait their turn"""
+
+    def __init__(self, driver, handle, lock):
+        self.driver, self.handle, self.lock = driver, handle, lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            show(self.driver, self.handle)
+        except Exception:
+            self.lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.lock.release()
+
+
+class Rotation(object):
+    """Which sport to scan next
+
+    weights is a list of sports, or {sport: weight} to scan some sports more often, i.e. {'Baseball': 2, 'Tennis': 1}
+    scans baseball twice for every tennis scan. The scans of each sport are spread evenly over a round
+    (smooth weighted round robin), so a sport is never left out for long"""
+
+    def __init__(self, weights):
+        self.weights = dict(weights) if isinstance(weights, dict) else dict.fromkeys(weights, 1)
+        self.credit = dict.fromkeys(self.weights, 0)
+
+    def next(self):
+        # Every sport earns its weight, the one with the most credit is scanned and pays back a whole round
+        for sport, weight in self.weights.items():
+            self.credit[sport] += weight
+        sport = max(self.credit, key=self.credit.get)
+        self.credit[sport] -= sum(self.weights.values())
+        return sport
@@ -0,0 +1,31 @@
+import asyncio
+
+import cooldown
+import scheduler
+
+
+def run(scheduler, seconds):
+    async def main():
+        try:
+            await asyncio.wait_for(scheduler.run(), seconds)
+        except asyncio.TimeoutError:
+            pass
+    asyncio.run(main())
+
+
+def test_cooled_down_market_is_not_placed_again():
+    # Two lines of the same event and market are found by one scan, and every scan finds them again
+    cooldowns, placed = cooldown.Cooldowns(), []
+    arbs = {('baseball', 'a vs b', 0, 1.5): 'arb', ('baseball', 'a vs b', 0, 2.5): 'arb',
+            ('baseball', 'c vs d', 2, 8.5): 'arb'}
+
+    async def scan():
+        pass
+
+    async def place(key, arb):
+        placed.append(key)
+        await asyncio.sleep(0.02)  # Scans land while the wager is placed
+        cooldowns.add(key[:3], 60)
+
+    run(scheduler.Scheduler(scan, lambda: dict(arbs), place, 0.001, ready=lambda key: key[:3] not in cooldowns), 0.2)
+    assert sorted(key[:3] for key in placed) == [('baseball', 'a vs b', 0), ('baseball', 'c vs d', 2)]
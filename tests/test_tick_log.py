@@ -0,0 +1,22 @@
+import tick_log
+
+EVENT = [['+1.5 -120', '-1.5 +100'], ['+150', '-170'], ['O 8.5 -110', 'U 8.5 -110'], 'Team 1', 'Team 2']
+
+
+def test_empty_first_board(tmp_path):
+    recorder = tick_log.TickRecorder(tmp_path / 'boards.log')
+    recorder.write('FanDuel', {})
+    recorder.write('FanDuel', {'team1 vs team2': EVENT})
+    recorder.close()
+    assert [events for seconds, book, events in tick_log.read(tmp_path / 'boards.log')] == [[], [EVENT]]
+
+
+def test_empty_board_round_trip(tmp_path):
+    recorder = tick_log.TickRecorder(tmp_path / 'boards.log')
+    recorder.write('FanDuel', [EVENT])
+    recorder.write('FanDuel', [])
+    recorder.write('FanDuel', [])
+    recorder.write('FanDuel', [EVENT])
+    recorder.close()
+    assert [(book, events) for seconds, book, events in tick_log.read(tmp_path / 'boards.log')] == \
+        [('FanDuel', [EVENT]), ('FanDuel', []), ('FanDuel', []), ('FanDuel', [EVENT])]
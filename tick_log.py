@@ -0,0 +1,99 @@
+import struct
+import time
+import zlib
+
+# Record every scraped board with a monotonic timestamp, and replay the boards later without the websites
+# The log is binary and compact: every string (names and wagers) is written once and then referred to by number,
+# so a board is a short header followed by the string number of every cell, compressed with zlib
+# A board with as many cells as the last board of its book only stores the difference to it, which is mostly zeros
+#   string record: b'S', length (uint16), utf-8 bytes. Strings are numbered in the order they are written
+#   board record:  b'B' (or b'D' for a difference), nanoseconds since the recording started (uint64),
+#                  book (string number), cells per event (uint8), events (uint32), compressed length (uint32),
+#                  then the string numbers of the cells (uint32 each), compressed
+# Events are in the l1 / l2 shape: [[spread1, spread2], [ml1, ml2], [total1, total2], team1, team2] (8 cells)
+# or [w1, w2, team1, team2] (4 cells)
+
+STRING = struct.Struct('<cH')
+BOARD = struct.Struct('<cQIBII')
+
+
+def flatten(event):
+    return [cell for item in event for cell in (item if isinstance(item, list) else [item])]
+
+
+def unflatten(cells):
+    if len(cells) == 8:
+        return [cells[0:2], cells[2:4], cells[4:6], cells[6], cells[7]]
+    return list(cells)
+
+
+class TickRecorder(object):
+    """Appends boards to a new log file"""
+
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.ids = dict()
+        self.last = dict()  # book -> string numbers of its last board
+        self.start = time.monotonic_ns()
+
+    def id(self, text):
+        if text not in self.ids:
+            data = str(text).encode('utf-8')
+            self.file.write(STRING.pack(b'S', len(data)) + data)
+            self.ids[text] = len(self.ids)
+        return self.ids[text]
+
+    def write(self, book, events):
+        # events is a list of events in the l1 / l2 shape, or a board of them
+        events = list(events.values()) if isinstance(events, dict) else events
+        rows = [flatten(event) for event in events]
+        width = len(rows[0]) if rows else 0
+        ids = [self.id(cell) for row in rows for cell in row]
+
+        kind, values = b'B', ids
+        if book in self.last and len(self.last[book]) == len(ids):
+            kind, values = b'D', [(n - last) % 2 ** 32 for n, last in zip(ids, self.last[book])]
+        self.last[book] = ids
+
+        data = zlib.compress(struct.pack('<%dI' % len(values), *values), 1)
+        self.file.write(BOARD.pack(kind, time.monotonic_ns() - self.start, self.id(book), width, len(rows), len(data)))
+        self.file.write(data)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read(path):
+    # Yields (seconds since the recording started, book, events) for every board in the log
+    strings, last = [], dict()
+    with open(path, 'rb') as file:
+        while True:
+            kind = file.read(1)
+            if not kind:
+                return
+            if kind == b'S':
+                length, = struct.unpack('<H', file.read(2))
+                strings.append(file.read(length).decode('utf-8'))
+            else:
+                nanoseconds, book, width, count, length = struct.unpack('<QIBII', file.read(BOARD.size - 1))
+                ids = struct.unpack('<%dI' % (width * count), zlib.decompress(file.read(length)))
+                if kind == b'D':
+                    ids = [(n + before) % 2 ** 32 for n, before in zip(ids, last[book])]
+                last[book] = ids
+                cells = [strings[n] for n in ids]
+                # A board with no events has no width
+                yield nanoseconds / 1e9, strings[book], \
+                    [unflatten(cells[n:n + width]) for n in range(0, len(cells), width)] if width else []
+
+
+def replay(path, speed=1.0):
+    # Same as read(), but waits between boards as long as the recording did (divided by speed)
+    # Use speed=None to replay as fast as possible
+    start = time.monotonic()
+    for seconds, book, events in read(path):
+        if speed:
+            wait = start + seconds / speed - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        yield seconds, book, events
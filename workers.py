@@ -0,0 +1,103 @@
+import multiprocessing
+import threading
+import time
+
+import tabs
+
+# Process mode: the browser and scraper of each sportsbook run in their own process, so reading the pages, parsing
+# and matching names use their own cores instead of taking turns with the engine (the tables, the solver and the
+# placement) on one. Each worker writes the events that changed into the odds table of the sport in shared memory
+# (shared_odds.py), and the engine sends it the steps of a placement (select, stake, submit, clear) over a pipe
+# Processes are spawned, which is the same on every platform, so the program has to start its App under
+# if __name__ == '__main__':
+
+context = multiprocessing.get_context('spawn')
+
+
+def serve(finder, scrape, writers, commands, running, interval=0.01):
+    # The loop of a worker process. scrape(sport) returns the board of a sport from finder, which is written with
+    # writers[sport] (a shared_odds.Writer). Answers commands with (True, result) or (False, error)
+    rotation = tabs.Rotation(finder.sports)
+    boards = dict()  # sport -> latest board, to find the event of a wager
+    buttons = dict()  # sport -> Place Bet button of the betslip, between stake and submit
+    while True:
+        # Placement steps go first, they are waiting on the other sportsbook
+        while commands.poll():
+            action, sport, args = commands.recv()
+            try:
+                commands.send((True, step(finder, action, sport, args, boards, buttons, writers)))
+            except Exception as e:
+                commands.send((False, repr(e)))
+
+        if running.is_set():
+            sport = rotation.next()
+            tic = time.perf_counter()
+            try:
+                boards[sport] = scrape(sport)
+                writers[sport].write(boards[sport], time.perf_counter() - tic)
+            except Exception:
+                pass
+        # Wake up early for a command
+        commands.poll(interval)
+
+
+def step(finder, action, sport, args, boards, buttons, writers):
+    # One placement step in the tab of the sport, as books.py does it
+    # The engine names events as it read them from the odds table, the writer knows their whole names
+    with finder.tabs[sport]:
+        if action == 'select':
+            event, market, side = args
+            return finder.book.select(finder.driver, boards[sport][writers[sport].event(event)], market, side)
+        if action == 'stake':
+            buttons[sport] = finder.book.stake(finder.driver, *args)
+            return buttons[sport] is not None
+        if action == 'submit':
+            return finder.book.submit(finder.driver, buttons.pop(sport, None))
+        if action == 'clear':
+            buttons.pop(sport, None)
+            return finder.book.clear(finder.driver)
+    raise ValueError('Unknown step ' + action)
+
+
+class Worker(object):
+    """The engine's end of a worker process, which runs the steps it is asked to
+
+    target(*args, commands, running) is the worker, a function at the top level of the program"""
+
+    def __init__(self, name, target, args, running):
+        self.name = name
+        self.commands, commands = context.Pipe()
+        self.lock = threading.Lock()  # One step at a time on the command pipe
+        self.process = context.Process(target=target, args=tuple(args) + (commands, running),
+                                       name=name, daemon=True)
+        self.process.start()
+
+    def call(self, action, sport, *args):
+        with self.lock:
+            self.commands.send((action, sport, args))
+            ok, result = self.commands.recv()
+        if not ok:
+            raise RuntimeError('{} {}: {}'.format(self.name, action, result))
+        return result
+
+
+class Remote(object):
+    """Stands in for a sportsbook from books.py in a placement.Leg, running each step in the worker process
+    The driver the Leg passes is not used, the worker has the browser"""
+
+    def __init__(self, worker, sport):
+        self.worker, self.sport = worker, sport
+
+    def select(self, driver, event, market, side):
+        # event is the name of the event ('smith vs jones'), the worker has its wagers
+        return self.worker.call('select', self.sport, event, market, side)
+
+    def stake(self, driver, bet_amount):
+        # True for the Place Bet button, which stays in the worker
+        return self.worker.call('stake', self.sport, bet_amount) or None
+
+    def submit(self, driver, button):
+        self.worker.call('submit', self.sport)
+
+    def clear(self, driver):
+        self.worker.call('clear', self.sport)